@@ -0,0 +1,39 @@
+import argparse
+import os
+import sys
+
+from src.batch import run_batch
+from src.validation import LEVELS
+
+def print_entry(name, entry):
+    ''' Function to print the result of one spec as soon as it is done '''
+    if entry["status"] == "done":
+        print(f'{name}: {sum(entry["seconds"].values()):.2f}s, {entry["endpoints"]} endpoints', flush=True)
+    else:
+        print(f'{name}: failed, {entry["error"]}', flush=True)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the testing templates for a directory or glob of OpenAPI Files")
+    parser.add_argument("inputs", nargs="+", help="directories, globs or files of OpenAPI Files")
+    parser.add_argument("--output", default="batch_output", help="directory for the templates and the manifest")
+    parser.add_argument("--workers", type=int, default=os.cpu_count(), help="number of worker processes")
+    parser.add_argument("--backend", choices=["memory", "neo4j"], default="memory")
+    parser.add_argument("--validation", choices=LEVELS, default="full")
+    parser.add_argument("--max-orderings", type=int, default=None, help="maximum number of object orders per endpoint")
+    parser.add_argument("--property-depth", type=int, default=None, help="maximum depth of the HAS_PROPERTY paths")
+    parser.add_argument("--force", action="store_true", help="process unchanged specs again")
+    args = parser.parse_args()
+    if args.property_depth is not None and args.property_depth < 1:
+        parser.error("--property-depth has to be at least 1")
+
+    summary = run_batch(
+        args.inputs, args.output, workers=args.workers, backend=args.backend, validation=args.validation,
+        max_orderings=args.max_orderings, max_depth=args.property_depth, force=args.force, progress=print_entry
+    )
+    print(
+        f'{summary["processed"]} processed, {summary["skipped"]} skipped, {summary["failed"]} failed '
+        f'of {summary["specs"]} specs in {summary["seconds"]:.2f}s'
+    )
+    for stage, seconds in summary["stage_seconds"].items():
+        print(f'    {stage}: {seconds:.2f}s')
+    sys.exit(1 if summary["failed"] else 0)
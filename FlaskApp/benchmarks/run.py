@@ -0,0 +1,135 @@
+import argparse
+import collections
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+
+from src.GraphBackend import create_backend, backend_config
+from src.GraphGenerator import GraphGenerator
+from src.SequenceGenerator import SequenceGenerator
+
+from .specgen import generate_spec, add_arguments, spec_options
+
+# Steps which are timed, ingest is GraphGenerator.create_graph and the others are the durations of SequenceGenerator
+STEPS = ["ingest", "load", "object_list", "object_crud", "endpoint_list"]
+
+def run_once(spec, spec_id, backend, max_orderings=None):
+    ''' Function to ingest the spec and create all templates once. Returns the duration of every step and the generator '''
+    start = time.perf_counter()
+    GraphGenerator(spec, spec_id, backend).create_graph()
+    durations = {"ingest": time.perf_counter() - start}
+
+    sg = SequenceGenerator(spec_id, backend, max_orderings=max_orderings)
+    sg.get_infos()
+    durations.update(sg.durations)
+    return durations, sg
+
+def measure_memory(spec, spec_id, backend, max_orderings=None):
+    ''' Function to get the peak of the traced python memory in bytes for the ingestion, the object templates and the endpoint_list '''
+    peaks = {}
+    tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        GraphGenerator(spec, spec_id, backend).create_graph()
+        peaks["ingest"] = tracemalloc.get_traced_memory()[1]
+
+        tracemalloc.reset_peak()
+        sg = SequenceGenerator(spec_id, backend, max_orderings=max_orderings)
+        sg.get_infos(endpoint_list=False)
+        peaks["object_templates"] = tracemalloc.get_traced_memory()[1]
+
+        # The entries are consumed one by one like the streamed downloads, none of them is kept
+        tracemalloc.reset_peak()
+        collections.deque(sg.iter_endpoint_list(), maxlen=0)
+        peaks["endpoint_list"] = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return peaks
+
+def run_benchmark(spec, backend, repeat=3, max_orderings=None, memory=True):
+    ''' Function to run the benchmark for one spec. Returns dict with the sizes, the durations of all runs and the memory peaks '''
+    spec_id = "benchmark"
+    runs = []
+    sg = None
+    for count in range(repeat):
+        backend.delete_graph(spec_id)
+        durations, sg = run_once(spec, spec_id, backend, max_orderings)
+        runs.append(durations)
+    peaks = None
+    if memory:
+        backend.delete_graph(spec_id)
+        peaks = measure_memory(spec, spec_id, backend, max_orderings)
+    backend.delete_graph(spec_id)
+
+    return {
+        "size": {
+            "objects": len(sg.graph.objects),
+            "endpoints": len(sg.graph.endpoints),
+            "relationships": len(sg.graph.relationships),
+            "preparation_sequences": sum(len(entry["preparation"]) for entry in sg.endpoint_list.values()),
+            "dismantling_sequences": sum(len(entry["dismantling"]) for entry in sg.endpoint_list.values())
+        },
+        "seconds": {
+            step: {
+                "min": min(durations[step] for durations in runs),
+                "median": statistics.median(durations[step] for durations in runs),
+                "runs": [durations[step] for durations in runs]
+            }
+            for step in STEPS
+        },
+        "peak_bytes": peaks
+    }
+
+def git_commit():
+    ''' Function to get the commit of the working tree, None outside of git '''
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True,
+            cwd=os.path.dirname(os.path.abspath(__file__))
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time the ingestion and the templates for a synthetic OpenAPI File")
+    add_arguments(parser)
+    parser.add_argument("--backend", choices=["memory", "neo4j"], default="memory")
+    parser.add_argument("--repeat", type=int, default=3, help="number of timed runs")
+    parser.add_argument("--max-orderings", type=int, default=None, help="maximum number of object orders per endpoint")
+    parser.add_argument("--no-memory", action="store_true", help="skip the traced run for the memory peaks")
+    parser.add_argument("--output", help="json file for the results, default stdout")
+    args = parser.parse_args()
+
+    if args.repeat < 1:
+        parser.error("--repeat has to be at least 1")
+    options = spec_options(args)
+    try:
+        spec = generate_spec(**options)
+    except ValueError as error:
+        parser.error(str(error))
+
+    backend = create_backend(backend_config(args.backend))
+    try:
+        result = run_benchmark(spec, backend, args.repeat, args.max_orderings, not args.no_memory)
+    finally:
+        backend.close()
+
+    result.update({
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "backend": args.backend,
+        "spec": options,
+        "max_orderings": args.max_orderings,
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S%z")
+    })
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(result, file, indent=4)
+    else:
+        json.dump(result, sys.stdout, indent=4)
+        print()
@@ -0,0 +1,132 @@
+import argparse
+import json
+import random
+import sys
+
+import yaml
+
+OPENAPI_VERSIONS = {"3.0": "3.0.3", "3.1": "3.1.0"}
+COLLECTION_OPERATIONS = ["post", "get", "put", "patch", "delete"]
+ITEM_OPERATIONS = ["get", "delete", "put", "patch", "post"]
+
+def generate_spec(schemas=20, fan_out=2, depth=3, paths=20, operations=3, parameters=1, crud=1, openapi="3.0", seed=0):
+    ''' Function to generate a synthetic OpenAPI File as dict.
+        schemas: number of component schemas, split into depth layers. Every schema refers to fan_out schemas of the next layer
+        paths: number of paths, alternating between collection paths and item paths of the schemas
+        operations: operations per path, parameters: query parameters per operation
+        crud: additional create and delete endpoints per schema. Raises ValueError for options without a valid spec '''
+    if schemas < 1 or depth < 1:
+        raise ValueError("schemas and depth have to be at least 1")
+    if fan_out < 0 or paths < 0 or parameters < 0 or crud < 0:
+        raise ValueError("fan_out, paths, parameters and crud must not be negative")
+    if not 1 <= operations <= len(COLLECTION_OPERATIONS):
+        raise ValueError(f'operations has to be between 1 and {len(COLLECTION_OPERATIONS)}')
+    if openapi not in OPENAPI_VERSIONS:
+        raise ValueError(f'openapi has to be one of {", ".join(sorted(OPENAPI_VERSIONS))}')
+    generator = random.Random(seed)
+    names = [f'Entity{index}' for index in range(schemas)]
+    layers = [index * depth // schemas for index in range(schemas)]
+
+    # Schemas with an id, a name and refs to the next layer, every second ref is a list
+    components = {}
+    for index, name in enumerate(names):
+        properties = {
+            "id": {"type": "integer"},
+            "name": {"type": "string"}
+        }
+        next_layer = [target for target in range(schemas) if layers[target] == layers[index] + 1]
+        for count, target in enumerate(generator.sample(next_layer, min(fan_out, len(next_layer)))):
+            ref = {"$ref": f'#/components/schemas/{names[target]}'}
+            properties[names[target].lower()] = ref if count % 2 == 0 else {"type": "array", "items": ref}
+        components[name] = {"type": "object", "properties": properties}
+
+    spec_paths = {}
+    for index in range(paths):
+        name = names[(index // 2) % schemas]
+        collection = f'/{name.lower()}s' if index // 2 < schemas else f'/{name.lower()}s/group{index // (2 * schemas)}'
+        if index % 2 == 0:
+            spec_paths[collection] = {
+                operation: _operation(name, operation, parameters, False)
+                for operation in COLLECTION_OPERATIONS[:operations]
+            }
+        else:
+            spec_paths[f'{collection}/{{id}}'] = {
+                operation: _operation(name, operation, parameters, True)
+                for operation in ITEM_OPERATIONS[:operations]
+            }
+
+    # Additional create and delete endpoints, each one is an alternative in the sequences of the schema
+    for name in names:
+        for count in range(crud):
+            spec_paths[f'/{name.lower()}s/import{count}'] = {"post": _operation(name, "post", 0, False)}
+            spec_paths[f'/{name.lower()}s/{{id}}/archive{count}'] = {"delete": _operation(name, "delete", 0, True)}
+
+    return {
+        "openapi": OPENAPI_VERSIONS[openapi],
+        "info": {"title": f'Benchmark API {schemas}x{fan_out}x{depth}', "version": "1.0"},
+        "paths": spec_paths,
+        "components": {"schemas": components}
+    }
+
+def _operation(name, operation, parameters, item):
+    ''' Function to create one operation on a schema with request body, response and parameters '''
+    ref = {"$ref": f'#/components/schemas/{name}'}
+    details = {"responses": {"204": {"description": "no content"}}}
+
+    operation_parameters = []
+    if item:
+        operation_parameters.append({"name": "id", "in": "path", "required": True, "schema": {"type": "integer"}})
+    for count in range(parameters):
+        operation_parameters.append({"name": f'filter{count}', "in": "query", "schema": {"type": "string"}})
+    if operation_parameters:
+        details["parameters"] = operation_parameters
+
+    if operation in ("post", "put", "patch"):
+        details["requestBody"] = {"content": {"application/json": {"schema": ref}}}
+    if operation == "get":
+        schema = ref if item else {"type": "array", "items": ref}
+        details["responses"] = {"200": {"description": "ok", "content": {"application/json": {"schema": schema}}}}
+    elif operation in ("post", "put"):
+        details["responses"] = {"201": {"description": "ok", "content": {"application/json": {"schema": ref}}}}
+    return details
+
+def add_arguments(parser):
+    ''' Function to add the options of generate_spec to an argument parser '''
+    parser.add_argument("--schemas", type=int, default=20, help="number of component schemas")
+    parser.add_argument("--fan-out", type=int, default=2, help="refs of every schema to the next layer")
+    parser.add_argument("--depth", type=int, default=3, help="number of schema layers")
+    parser.add_argument("--paths", type=int, default=20, help="number of collection and item paths")
+    parser.add_argument("--operations", type=int, default=3, help="operations per path (1-5)")
+    parser.add_argument("--parameters", type=int, default=1, help="query parameters per operation")
+    parser.add_argument("--crud", type=int, default=1, help="additional create and delete endpoints per schema")
+    parser.add_argument("--openapi", choices=sorted(OPENAPI_VERSIONS), default="3.0", help="OpenAPI version")
+    parser.add_argument("--seed", type=int, default=0, help="seed for the refs between the schemas")
+
+def spec_options(args):
+    ''' Function to get the keyword arguments of generate_spec from parsed arguments '''
+    return {
+        "schemas": args.schemas,
+        "fan_out": args.fan_out,
+        "depth": args.depth,
+        "paths": args.paths,
+        "operations": args.operations,
+        "parameters": args.parameters,
+        "crud": args.crud,
+        "openapi": args.openapi,
+        "seed": args.seed
+    }
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Write a synthetic OpenAPI File to stdout")
+    add_arguments(parser)
+    parser.add_argument("--format", choices=["yaml", "json"], default="yaml")
+    args = parser.parse_args()
+
+    try:
+        spec = generate_spec(**spec_options(args))
+    except ValueError as error:
+        parser.error(str(error))
+    if args.format == "json":
+        json.dump(spec, sys.stdout, indent=2)
+    else:
+        yaml.safe_dump(spec, sys.stdout, sort_keys=False)
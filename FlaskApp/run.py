@@ -1,6 +1,6 @@
 from src import create_app
 
-app = create_app()
-
 if __name__ == "__main__":
+    # Only the started process creates the app, the spawned SEQUENCE_WORKERS processes import this module as __mp_main__
+    app = create_app()
     app.run(host="0.0.0.0", debug=True)
\ No newline at end of file
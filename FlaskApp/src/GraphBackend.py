@@ -0,0 +1,46 @@
+import os
+
+class GraphBackend():
+    ''' Interface for the storage of the Object Endpoint Dependency Graphs, one graph per spec namespace '''
+
+    def delete_graph(self, spec_id):
+        ''' Function to delete all nodes and relationships of a spec namespace '''
+        raise NotImplementedError
+
+    def write_graph(self, spec_id, graph):
+        ''' Function to write the nodes and connections collected by GraphGenerator into a spec namespace '''
+        raise NotImplementedError
+
+    def update_graph(self, spec_id, diff):
+        ''' Function to apply a diff from graphdiff.diff_graphs to a spec namespace, removed rows first '''
+        raise NotImplementedError
+
+    def load_graph(self, spec_id):
+        ''' Function to load the graph of a spec namespace. Returns a GraphSnapshot '''
+        raise NotImplementedError
+
+    def close(self):
+        ''' Function to release the resources of the backend '''
+        pass
+
+def create_backend(config):
+    ''' Function to create the backend selected with GRAPH_BACKEND in the app config '''
+    if config['GRAPH_BACKEND'] == "memory":
+        from .MemoryBackend import MemoryBackend
+        return MemoryBackend()
+    if config['GRAPH_BACKEND'] == "neo4j":
+        from .Neo4jBackend import Neo4jBackend
+        return Neo4jBackend.from_config(config)
+    raise ValueError(f'Unknown graph backend {config["GRAPH_BACKEND"]}')
+
+def backend_config(backend):
+    ''' Function to get the config for create_backend outside of the app, the neo4j connection is taken from the same variables '''
+    from .database import DATABASE
+    return {
+        'GRAPH_BACKEND': backend,
+        'NEO4J_URI': os.environ.get('NEO4J_URI', 'bolt://neo4j:7687/'),
+        'NEO4J_DATABASE': os.environ.get('NEO4J_DATABASE', DATABASE),
+        'NEO4J_MAX_POOL_SIZE': int(os.environ.get('NEO4J_MAX_POOL_SIZE', 50)),
+        'NEO4J_ACQUISITION_TIMEOUT': float(os.environ.get('NEO4J_ACQUISITION_TIMEOUT', 60)),
+        'NEO4J_BATCH_SIZE': int(os.environ.get('NEO4J_BATCH_SIZE', 1000))
+    }
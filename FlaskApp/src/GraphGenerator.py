@@ -1,46 +1,51 @@
-import json
-import yaml
 import inflect
-from neo4j import GraphDatabase
 
-URI = "bolt://neo4j:7687/"
+from . import metrics
+from .RefResolver import RefResolver
+from .graphdiff import diff_graphs, is_empty
+from .SpecCache import load_spec
+
+# Keys of a path item which are operations, the others like summary, servers or parameters are no Endpoints
+OPERATIONS = ("get", "put", "post", "delete", "options", "head", "patch", "trace")
 
 class GraphGenerator():
-    def __init__(self, openapi_file):
+    def __init__(self, openapi_file, spec_id, backend):
         ''' Init Function '''
+        # Namespace of the graph, all nodes and relationships get it as spec property
+        self.spec_id = spec_id
+        # Storage backend (neo4j or in-memory) for the graph
+        self.backend = backend
+
         # Create Inflect Object for singular/plural words
         self.p = inflect.engine()
 
-        # Import json or yaml file
-        if openapi_file[-4:] == "json":
-            with open(openapi_file, "r") as file:
-                spec_data = json.load(file)
-        elif openapi_file[-4:] == "yaml":
-            with open(openapi_file, "r") as file:
-                spec_data = yaml.safe_load(file)
-
-        # Connect to neo4j GraphDatabase 
-        self.driver = GraphDatabase.driver(URI)
-        self.database = "neo4j"
-        self.driver.verify_connectivity()
-        # Reset/clear database
-        self.driver.execute_query(
-            "MATCH (n) DETACH DELETE n",
-            database_=self.database
-        )
-
-        # Add OpenAPIFile Node to database
-        self.driver.execute_query(
-            "CREATE (:OpenAPIFile {name: $name, version: $version, openapi_version: $openapi_version})", 
-            name=spec_data["info"]["title"],
-            version=spec_data["info"]["version"],
-            openapi_version=spec_data["openapi"],
-            database_=self.database
-        )
+        # Use the already parsed spec or import the json or yaml file
+        if isinstance(openapi_file, dict):
+            spec_data = openapi_file
+        else:
+            spec_data = load_spec(openapi_file)
+
+        # Generic informations about the API for the OpenAPIFile Node
+        self.info = {
+            'name': spec_data["info"]["title"],
+            'version': spec_data["info"]["version"],
+            'openapi_version': spec_data["openapi"]
+        }
 
         # Save schemas and paths in class variables
         self.schemas = self.__get_nested_value(spec_data, ["components", "schemas"], {})
         self.paths = self.__get_nested_value(spec_data, ["paths"], {})
+
+        # Resolver for all refs in the file, every ref and schema is only resolved once
+        self.resolver = RefResolver(spec_data)
+
+        # Index of the lower case schema names with their position in the file, the first schema wins for equal names
+        self.schema_index = {}
+        for position, schema_name in enumerate(self.schemas):
+            self.schema_index.setdefault(schema_name.lower(), (position, schema_name))
+        # Memoised inflect results and potential Objects per path
+        self.singular_nouns = {}
+        self.potential_objects = {}
    
     def __get_nested_value(self, dictionary, keys, default):
         ''' Private Function to get a nested value from a dictionary '''
@@ -54,109 +59,91 @@ class GraphGenerator():
 
     def create_graph(self):
         ''' Public Function to create the Object Endpoint Dependency Graph '''
-        # Add all Objects nodes to database
-        for object_name in self.schemas.keys():
-            self.driver.execute_query(
-                "CREATE (:Object {name: $name})",
-                name=object_name,
-                database_=self.database
-            )
-
-        # Add property coonections to new created Property Nodes or Object Nodes
-        for object_name, object_details in self.schemas.items():
-            properties = self.__get_nested_value(object_details, ["properties"], {})
-            for property_name, property_details in properties.items():
-                # If ref exists create connection to Object Node
-                ref = self.__get_nested_value(property_details, ["$ref"], "")
-                if ref.startswith("#/components/schemas/"):
-                    ref_object_name = ref[21:]
-                    self.driver.execute_query("""
-                        MATCH (o1:Object {name: $o1_name})
-                        MATCH (o2:Object {name: $o2_name})
-                        CREATE (o1)-[:HAS_PROPERTY {name: $p_name, list: False}]->(o2)
-                        """,
-                        o1_name=object_name,
-                        o2_name=ref_object_name,
-                        p_name=property_name,
-                        database_=self.database
-                    )
-                    continue
-                # If items-ref exists create connection to Object Node
-                items_ref = self.__get_nested_value(property_details, ["items", "$ref"], "")
-                if items_ref.startswith("#/components/schemas/"):
-                    items_ref_object_name = items_ref[21:]
-                    self.driver.execute_query("""
-                        MATCH (o1:Object {name: $o1_name})
-                        MATCH (o2:Object {name: $o2_name})
-                        CREATE (o1)-[:HAS_PROPERTY {name: $p_name, list: True}]->(o2)
-                        """,
-                        o1_name=object_name,
-                        o2_name=items_ref_object_name,
-                        p_name=property_name,
-                        database_=self.database
-                    )
-
-        # Add all Endpoint Nodes with connections to Object Nodes
+        # Build all nodes and connections in memory first
+        graph = self.__build_graph()
+
+        # Reset/clear only the namespace of this spec, other graphs stay untouched
+        with metrics.stage("clear"):
+            self.backend.delete_graph(self.spec_id)
+        # Write the whole graph at once
+        self.backend.write_graph(self.spec_id, graph)
+
+    def update_graph(self):
+        ''' Public Function to bring the stored graph of the namespace up to date by writing only the changed nodes and connections.
+            Returns the diff, or None if the namespace was empty and the whole graph was written '''
+        graph = self.__build_graph()
+
+        stored = self.backend.load_graph(self.spec_id)
+        if not stored.info:
+            with metrics.stage("clear"):
+                self.backend.delete_graph(self.spec_id)
+            self.backend.write_graph(self.spec_id, graph)
+            return None
+
+        diff = diff_graphs(stored.to_graph(), graph)
+        if not is_empty(diff):
+            self.backend.update_graph(self.spec_id, diff)
+        return diff
+
+    def __build_graph(self):
+        ''' Private Function to collect all nodes and connections of the graph. Returns dict with lists of rows '''
+        graph = {
+            'info': self.info,
+            'objects': [],
+            'has_property': [],
+            'endpoints': [],
+            'request_body': [],
+            'parameters': [],
+            'responses': []
+        }
+
+        # All Objects nodes with their property connections to Object Nodes, nested inline objects are Objects too
+        for object_name, property_rows in self.resolver.iter_object_properties():
+            graph['objects'].append({'name': object_name})
+            graph['has_property'].extend(property_rows)
+
+        # All Endpoint Nodes with connections to Object Nodes
         for path, operations in self.paths.items():
             for operation_name, operation_details in operations.items():
+                if operation_name not in OPERATIONS:
+                    continue
                 # Get dict with requestBody, parameters and responses and each related Objects from a endpoint
                 objects_from_endpoint = self.__get_objects_form_endpoint(path, operation_details)
+                endpoint_name = f'{path}, {operation_name}'
 
-                # Add Endpoint Node to database
-                self.driver.execute_query(
-                    "CREATE (:Endpoint {name: $name, path: $path, operation: $operation})",
-                    name=f'{path}, {operation_name}',
-                    path=path,
-                    operation=operation_name,
-                    database_=self.database
-                )
+                graph['endpoints'].append({
+                    'name': endpoint_name,
+                    'path': path,
+                    'operation': operation_name
+                })
 
-                # Add all connections between Endpoint Node and Object Nodes
                 # First connections from Request_Body
                 for object in objects_from_endpoint["request_body"]:
-                    self.driver.execute_query("""
-                        MATCH (e:Endpoint {name: $e_name})
-                        MATCH (o:Object {name: $o_name})
-                        CREATE (o)-[:IN_REQUEST_BODY]->(e)
-                        """,
-                        e_name=f'{path}, {operation_name}',
-                        o_name=object,
-                        database_=self.database
-                    )
+                    graph['request_body'].append({
+                        'endpoint': endpoint_name,
+                        'object': object
+                    })
                 # Second connections from parameters
                 for parameter, parameter_details in objects_from_endpoint["parameters"].items():
-                    self.driver.execute_query("""
-                        MATCH (e:Endpoint {name: $e_name})
-                        MATCH (o:Object {name: $o_name})
-                        CREATE (o)-[:IS_PARAMETER {parameter_name: $parameter_name, property_name: $property_name}]->(e)
-                        """,
-                        e_name=f'{path}, {operation_name}',
-                        o_name=parameter_details["object"],
-                        parameter_name=parameter,
-                        property_name=parameter_details["property"],
-                        database_=self.database
-                    )
+                    graph['parameters'].append({
+                        'endpoint': endpoint_name,
+                        'object': parameter_details["object"],
+                        'parameter_name': parameter,
+                        'property_name': parameter_details["property"]
+                    })
                 # Last connections from responses
                 for response, response_details in objects_from_endpoint["responses"].items():
                     for object in response_details:
-                        self.driver.execute_query("""
-                            MATCH (e:Endpoint {name: $e_name})
-                            MATCH (o:Object {name: $o_name})
-                            CREATE (e)-[:IN_RESPONSE_BODY {status_code: $status_code}]->(o)
-                            """,
-                            e_name=f'{path}, {operation_name}',
-                            o_name=object,
-                            status_code=response,
-                            database_=self.database
-                        )
-
-        # Close neo4j driver connection
-        self.driver.close()
+                        graph['responses'].append({
+                            'endpoint': endpoint_name,
+                            'object': object,
+                            'status_code': response
+                        })
+
+        return graph
 
     def __get_objects_form_endpoint(self, path, operation_details):
         ''' Private Function to get all related Objects from a endpoint. Returns dict with results '''
-        print(path) # - Debug Info
-
         # Create empty dict endpoint
         endpoint = {
             'request_body': [],
@@ -165,7 +152,8 @@ class GraphGenerator():
         }
 
         # First get related Objects from requestBody
-        requestBody_content = self.__get_nested_value(operation_details, ["requestBody", "content"], {})
+        requestBody = self.resolver.resolve(self.__get_nested_value(operation_details, ["requestBody"], {}))
+        requestBody_content = self.__get_nested_value(requestBody, ["content"], {})
         if requestBody_content:
             # Filter the Object from the content
             endpoint['request_body'] = self.__objects_from_content(requestBody_content)
@@ -176,12 +164,14 @@ class GraphGenerator():
             # Search for potential Object
             potential_schema = self.__get_potential_object(path)
             for parameter in parameters:
+                parameter = self.resolver.resolve(parameter)
                 endpoint['parameters'][parameter["name"]] = self.__objects_from_parameter(parameter, potential_schema)
 
         # Last get related Objects to all responses
         responses = self.__get_nested_value(operation_details, ['responses'], {})
         if responses:
             for http_status, response_details in responses.items():
+                response_details = self.resolver.resolve(response_details)
                 response_content = self.__get_nested_value(response_details, ["content"], {})
                 if response_content:
                     endpoint['responses'][http_status] = self.__objects_from_content(response_content)
@@ -193,26 +183,19 @@ class GraphGenerator():
         # Create empty list of Objects
         related_objects = []
 
-        # Iterate through all media_types with its details and search for refs
+        # Iterate through all media_types with its details and search for refs in the schema, its items and allOf/oneOf/anyOf parts
         for media_type, details in content.items():
-            # First check if a schema ref exists
-            ref = self.__get_nested_value(details, ["schema", "$ref"], "")
-            if ref.startswith("#/components/schemas/"):
-                ref_object_name = ref[21:]
+            for ref_object_name in self.resolver.schema_objects(self.__get_nested_value(details, ["schema"], {})):
                 if ref_object_name not in related_objects:
                         related_objects.append(ref_object_name)
 
-            # Second check if a schema items ref exists
-            items_ref = self.__get_nested_value(details, ["schema", "items", "$ref"], "")
-            if items_ref.startswith("#/components/schemas/"):
-                items_ref_object_name = items_ref[21:]
-                if items_ref_object_name not in related_objects:
-                        related_objects.append(items_ref_object_name)
-
         return related_objects
 
     def __get_potential_object(self, path):
         ''' Private Function to get a potential Object for a path name. Return this Obejct as schema'''
+        if path in self.potential_objects:
+            return self.potential_objects[path]
+
         potential_object = {}
         splitted_path = path[1:].split("/")
 
@@ -220,23 +203,27 @@ class GraphGenerator():
         for count, path_word in enumerate(splitted_path):
             for i in range(count, len(splitted_path)+1):
                 word = ''.join(splitted_path[count: i+1])
-                # Checks if a schema name with this word in lower cases or in singular exists
-                for schema_name, schema_infos in self.schemas.items():
-                    if word.lower() == schema_name.lower():
-                        potential_object = {
-                            "schema": schema_name,
-                            "schema_details": schema_infos
-                        }
-                        break
-                    if word != '' and self.p.singular_noun(word) and self.p.singular_noun(word.lower()) == schema_name.lower(): # Returns False when a singular word is passed
-                        potential_object = {
-                            "schema": schema_name,
-                            "schema_details": schema_infos
-                        }
-                        break
+                # Checks if a schema name with this word in lower cases or in singular exists, the first schema in the file wins
+                matches = [self.schema_index.get(word.lower())]
+                if word != '' and self.__singular_noun(word): # Returns False when a singular word is passed
+                    matches.append(self.schema_index.get(self.__singular_noun(word.lower())))
+                matches = [match for match in matches if match is not None]
+                if matches:
+                    position, schema_name = min(matches)
+                    potential_object = {
+                        "schema": schema_name,
+                        "schema_details": self.schemas[schema_name]
+                    }
 
+        self.potential_objects[path] = potential_object
         return potential_object
 
+    def __singular_noun(self, word):
+        ''' Private Function to get the singular of a word with inflect, every word is only looked up once '''
+        if word not in self.singular_nouns:
+            self.singular_nouns[word] = self.p.singular_noun(word)
+        return self.singular_nouns[word]
+
     def __objects_from_parameter(self, parameter, potential_object):
         ''' Private Function to check if the potential Object fits to parameter'''
         # If no potential Object exists return ""
@@ -247,25 +234,16 @@ class GraphGenerator():
             }
         
         if parameter["in"] == "path" or parameter["in"] == "query":
-            # Iterate through all propertys from the potential_object
-            for property_name, property_details in self.__get_nested_value(potential_object["schema_details"], ["properties"], {}).items():
+            parameter_type = self.__get_nested_value(self.resolver.resolve(parameter.get("schema", {})), ["type"], "")
+            # Iterate through all propertys from the potential_object, including the ones from refs and allOf parts
+            for property_name, property_details in self.resolver.properties(potential_object["schema_details"]).items():
                 # Check if name and type are the same
-                if property_name == parameter["name"] and self.__get_nested_value(property_details, ['type'], "") == parameter["schema"]["type"]:
-                    # Check if the property from the potential Object has an ref
-                    ref = self.__get_nested_value(property_details, ["$ref"], "")
-                    if ref.startswith("#/components/schemas/"):
-                        ref_object_name = items_ref[21:]
-                        return {
-                            "object": ref_object_name,
-                            "property": ""
-                        }
-                    
-                    # Check if the property from the potential Object has an items ref
-                    items_ref = self.__get_nested_value(property_details, ["items", "$ref"], "")
-                    if items_ref.startswith("#/components/schemas/"):
-                        items_ref_object_name = items_ref[21:]
+                if property_name == parameter["name"] and self.__get_nested_value(self.resolver.resolve(property_details), ['type'], "") == parameter_type:
+                    # Check if the property from the potential Object has an ref or items ref
+                    property_targets = self.resolver.property_targets(potential_object["schema"], property_name, property_details)
+                    if property_targets:
                         return {
-                            "object": items_ref_object_name,
+                            "object": property_targets[0][0],
                             "property": ""
                         }
                     
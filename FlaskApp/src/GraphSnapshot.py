@@ -0,0 +1,153 @@
+from .graphdiff import relationship_row
+
+class GraphSnapshot():
+    def __init__(self, info, objects, endpoints, relationships):
+        ''' Init Function '''
+        # Generic informations about the API from the OpenAPIFile Node
+        self.info = info
+        # Object names and Endpoint details (path, operation) by name, both in node order
+        self.objects = objects
+        self.endpoints = endpoints
+        # All relationships with their properties, as loaded from the backend
+        self.relationships = relationships
+        # Position of every Object in node order
+        self.object_position = {object_name: count for count, object_name in enumerate(objects)}
+
+        # Adjacency lists for the connections between Endpoint and Object Nodes and for HAS_PROPERTY
+        self.object_relationships = {object_name: [] for object_name in objects}
+        self.endpoint_relationships = {endpoint_name: [] for endpoint_name in endpoints}
+        self.has_property = {object_name: [] for object_name in objects}
+        for relationship in relationships:
+            if relationship['type'] == "HAS_PROPERTY":
+                self.has_property[relationship['start']].append(relationship['end'])
+                continue
+            # IN_RESPONSE_BODY points from the Endpoint to the Object, all others from the Object to the Endpoint
+            if relationship['type'] == "IN_RESPONSE_BODY":
+                endpoint_name, object_name = relationship['start'], relationship['end']
+            else:
+                object_name, endpoint_name = relationship['start'], relationship['end']
+            self.object_relationships[object_name].append({
+                'type': relationship['type'],
+                'endpoint': endpoint_name,
+                'properties': relationship['properties']
+            })
+            self.endpoint_relationships[endpoint_name].append({
+                'type': relationship['type'],
+                'object': object_name,
+                'properties': relationship['properties']
+            })
+
+        # Strongly connected components of the HAS_PROPERTY graph, created on first use, and the memoised paths
+        self.components = None
+        self.component_of = None
+        self.component_paths = {}
+        self.paths = {}
+
+    def property_paths(self, object_name, max_depth=None):
+        ''' Function to get all HAS_PROPERTY paths from an Object to Objects without further properties, longest paths first.
+            Cycles are condensed: the Objects of a cycle follow each other once in node order and a path ends at a cycle
+            without properties to other Objects. max_depth limits the number of Objects and cycles on a path (None = all).
+            The paths are created once per snapshot, so all endpoints share them '''
+        key = (object_name, max_depth)
+        if key not in self.paths:
+            self.__condense()
+            paths = [path for path in self.__component_paths(self.component_of[object_name], max_depth) if len(path) > 1]
+            paths.sort(key=len, reverse=True)
+            self.paths[key] = paths
+        return self.paths[key]
+
+    def __component_paths(self, component, depth):
+        ''' Private Function to get the paths from a component to the components without properties to other components '''
+        key = (component, depth)
+        if key in self.component_paths:
+            return self.component_paths[key]
+
+        chain = self.components[component]
+        # Properties to other components, every component is only followed once
+        targets = []
+        for object_name in chain:
+            for property_object in self.has_property[object_name]:
+                target = self.component_of[property_object]
+                if target != component and target not in targets:
+                    targets.append(target)
+
+        if not targets or depth == 1:
+            paths = [chain]
+        else:
+            paths = []
+            for target in targets:
+                for path in self.__component_paths(target, None if depth is None else depth - 1):
+                    paths.append(chain + path)
+
+        self.component_paths[key] = paths
+        return paths
+
+    def __condense(self):
+        ''' Private Function to find the strongly connected components of the HAS_PROPERTY graph with Tarjan's algorithm.
+            The members of every component are saved in node order '''
+        if self.components is not None:
+            return
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        components = []
+
+        for root in self.objects:
+            if root in index:
+                continue
+            index[root] = low[root] = len(index)
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, 0)]
+            while work:
+                object_name, count = work[-1]
+                property_objects = self.has_property[object_name]
+                if count < len(property_objects):
+                    work[-1] = (object_name, count + 1)
+                    property_object = property_objects[count]
+                    if property_object not in index:
+                        index[property_object] = low[property_object] = len(index)
+                        stack.append(property_object)
+                        on_stack.add(property_object)
+                        work.append((property_object, 0))
+                    elif property_object in on_stack:
+                        low[object_name] = min(low[object_name], index[property_object])
+                    continue
+
+                # All properties are visited, the Object is the root of a component if it can't reach an earlier Object
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[object_name])
+                if low[object_name] == index[object_name]:
+                    members = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        members.append(member)
+                        if member == object_name:
+                            break
+                    components.append(sorted(members, key=self.object_position.get))
+
+        self.component_of = {}
+        for component, members in enumerate(components):
+            for member in members:
+                self.component_of[member] = component
+        self.components = components
+
+    def to_graph(self):
+        ''' Function to get the stored graph as dict with lists of rows, in the same format GraphGenerator collects '''
+        graph = {
+            'info': {key: value for key, value in self.info.items() if key != 'spec'},
+            'objects': [{'name': object_name} for object_name in self.objects],
+            'has_property': [],
+            'endpoints': [dict(endpoint, name=endpoint_name) for endpoint_name, endpoint in self.endpoints.items()],
+            'request_body': [],
+            'parameters': [],
+            'responses': []
+        }
+        for relationship in self.relationships:
+            part, row = relationship_row(relationship)
+            graph[part].append(row)
+        return graph
@@ -0,0 +1,285 @@
+from concurrent.futures import ThreadPoolExecutor
+from collections import OrderedDict
+import os
+import threading
+import time
+import uuid
+
+from . import metrics
+from .GraphGenerator import GraphGenerator
+from .SequenceGenerator import SequenceGenerator
+from .ResultCache import spec_hash, result_key
+from .SpecCache import SpecCache, raw_hash, parse_spec
+from .validation import validate_spec
+
+class Job():
+    def __init__(self, path, filename, namespace=None, validation=None):
+        ''' Init Function '''
+        self.id = uuid.uuid4().hex
+        self.path = path
+        self.filename = filename
+        # Fixed namespace which is updated incrementally with every upload, without one the content hash is used
+        self.namespace = namespace
+        # Validation level of the upload (full, structural or off), None for the default of the app
+        self.validation_level = validation
+        # Level, cache hit and duration in seconds of the validation
+        self.validation = None
+
+        # Current stage and the duration in seconds of every finished stage
+        self.stage = "queued"
+        self.stage_times = {}
+        self.error = None
+        self.spec_hash = None
+        # Namespace of the graph in the backend, the fixed namespace or the content hash. The spec hash only keys the results
+        self.graph_id = None
+        # Number of changed Objects and Endpoints and of recomputed endpoint entries in incremental mode
+        self.changes = None
+
+        self.created = time.monotonic()
+        self.finished = None
+
+    def is_finished(self):
+        ''' Function to check if the job is done or failed '''
+        return self.stage in ("done", "failed")
+
+    def elapsed(self):
+        ''' Function to get the seconds since the upload, until the job finished '''
+        end = self.finished if self.finished is not None else time.monotonic()
+        return end - self.created
+
+    def to_dict(self):
+        ''' Function to get the status of the job as dictionary '''
+        return {
+            'id': self.id,
+            'filename': self.filename,
+            'stage': self.stage,
+            'stage_times': self.stage_times,
+            'elapsed': round(self.elapsed(), 3),
+            'error': self.error,
+            'spec_hash': self.spec_hash,
+            'graph_id': self.graph_id,
+            'namespace': self.namespace,
+            'changes': self.changes,
+            'validation': self.validation
+        }
+
+class JobManager():
+    def __init__(self, result_cache, backend, max_workers=1, max_jobs=100, sequence_pool=None, spec_cache=None, validation="full", property_depth=None, max_graphs=16):
+        ''' Init Function '''
+        # Shared graph backend of the app
+        self.backend = backend
+
+        # Parsed and validated specs by the hash of the uploaded bytes, re-uploads skip parsing and validation
+        self.spec_cache = spec_cache if spec_cache is not None else SpecCache()
+        # Validation level for uploads without their own level
+        self.validation = validation
+        # Maximum number of Objects and cycles on a HAS_PROPERTY path (None = all)
+        self.property_depth = property_depth
+
+        # Results of finished jobs are stored in the result cache under the spec hash and the property depth
+        self.result_cache = result_cache
+
+        # Local worker pool, the jobs are kept until more than max_jobs are known
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self.max_jobs = max_jobs
+        self.jobs = OrderedDict()
+        # Optional process pool for the sequences of the endpoints
+        self.sequence_pool = sequence_pool
+        self.lock = threading.Lock()
+
+        # Jobs for the same spec share one namespace, so they have to run one after another
+        self.spec_locks = {}
+        # Spec hash of the last upload of every fixed namespace, its results are the base for the next upload
+        self.namespace_hashes = {}
+        # Content hash namespaces in the backend, the least recently uploaded graphs above max_graphs are deleted
+        self.max_graphs = max_graphs
+        self.graphs = OrderedDict()
+
+    def submit(self, path, filename, namespace=None, validation=None):
+        ''' Function to start processing an uploaded OpenAPI File. Returns the new job '''
+        job = Job(path, filename, namespace, validation)
+        with self.lock:
+            self.jobs[job.id] = job
+            self.__forget_old_jobs()
+        self.executor.submit(self.__run, job)
+        return job
+
+    def get(self, job_id):
+        ''' Function to get a job by its id. Returns None for unknown jobs '''
+        with self.lock:
+            return self.jobs.get(job_id)
+
+    def graph_id(self, spec_hash):
+        ''' Function to get the namespace which holds the graph of a spec hash: the fixed namespace whose last upload it is,
+            else the content hash namespace '''
+        with self.lock:
+            for namespace, namespace_hash in self.namespace_hashes.items():
+                if namespace_hash == spec_hash:
+                    return namespace
+        return spec_hash
+
+    def has_graph(self, spec_hash):
+        ''' Function to check if the graph of a spec hash is kept in the backend, as content hash namespace or as last upload
+            into a fixed namespace '''
+        with self.lock:
+            return spec_hash in self.graphs or spec_hash in self.namespace_hashes.values()
+
+    def shutdown(self):
+        ''' Function to stop the worker pool after the running jobs '''
+        self.executor.shutdown(wait=True)
+
+    def __forget_old_jobs(self):
+        ''' Private Function to drop the oldest finished jobs above max_jobs '''
+        for job_id in list(self.jobs.keys()):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id].is_finished():
+                del self.jobs[job_id]
+
+    def __run(self, job):
+        ''' Private Function to run all stages of a job one after another '''
+        try:
+            # The content hash is the namespace of the graph in the database
+            spec_dict, job.spec_hash = self.__stage(job, "parse", self.__parse, job)
+            job.graph_id = job.namespace or job.spec_hash
+            self.__stage(job, "validate", self.__validate, job, spec_dict)
+            if job.namespace is not None:
+                with self.__spec_lock(job.namespace):
+                    # The namespace does not hold the graph of the previous upload anymore while it is updated
+                    with self.lock:
+                        previous_hash = self.namespace_hashes.pop(job.namespace, None)
+                    # The fixed namespace always holds the last upload, only the changes are written
+                    diff = self.__stage(job, "ingest", self.__update, job, spec_dict)
+                    if diff is not None:
+                        job.changes = {key: len(names) for key, names in diff['changed'].items()}
+                    if self.result_cache.get(self.__result_key(job.spec_hash)) is None:
+                        recomputed = self.__stage(job, "sequence", self.__sequence, job, previous_hash)
+                        if job.changes is not None:
+                            job.changes['recomputed'] = recomputed
+                    with self.lock:
+                        self.namespace_hashes[job.namespace] = job.spec_hash
+            else:
+                with self.__spec_lock(job.spec_hash):
+                    # An identical spec was already processed if its results are cached, the graph is only
+                    # ingested again if it was deleted in the meantime
+                    cached = self.result_cache.get(self.__result_key(job.spec_hash)) is not None
+                    if not cached or job.spec_hash not in self.graphs:
+                        self.__stage(job, "ingest", self.__ingest, job, spec_dict)
+                    if not cached:
+                        self.__stage(job, "sequence", self.__sequence, job)
+                    evicted = self.__keep_graph(job.spec_hash)
+                self.__delete_graphs(evicted)
+            job.stage = "done"
+        except Exception as error:
+            job.error = str(error)
+            job.stage = "failed"
+        job.finished = time.monotonic()
+
+    def __keep_graph(self, spec_id):
+        ''' Private Function to mark the graph of a content hash namespace as recently used.
+            Returns the least recently used namespaces above max_graphs '''
+        with self.lock:
+            self.graphs[spec_id] = None
+            self.graphs.move_to_end(spec_id)
+            evicted = []
+            while len(self.graphs) > self.max_graphs:
+                evicted.append(self.graphs.popitem(last=False)[0])
+        return evicted
+
+    def __delete_graphs(self, evicted):
+        ''' Private Function to delete the graphs of evicted namespaces, their results stay cached. It is called without
+            holding a spec lock, so two jobs never wait for each other '''
+        for evicted_id in evicted:
+            with self.__spec_lock(evicted_id):
+                # An upload of the same spec may have ingested it again in the meantime
+                with self.lock:
+                    if evicted_id in self.graphs:
+                        continue
+                self.backend.delete_graph(evicted_id)
+
+    def __spec_lock(self, spec_id):
+        ''' Private Function to get the lock of a spec namespace '''
+        with self.lock:
+            return self.spec_locks.setdefault(spec_id, threading.Lock())
+
+    def __stage(self, job, stage, function, *args):
+        ''' Private Function to run one stage of a job and measure its duration '''
+        job.stage = stage
+        start = time.monotonic()
+        result = function(*args)
+        seconds = time.monotonic() - start
+        job.stage_times[stage] = round(seconds, 3)
+        metrics.record_stage(stage, seconds)
+        return result
+
+    def __parse(self, job):
+        ''' Private Function to read the uploaded file, a file with known content is not parsed again.
+            Returns the parsed spec and its content hash '''
+        try:
+            with open(job.path, "rb") as file:
+                data = file.read()
+        finally:
+            # The upload is only read once, so the upload folder does not grow with every job
+            try:
+                os.remove(job.path)
+            except OSError:
+                pass
+        key = raw_hash(data)
+        cached = self.spec_cache.get(key)
+        if cached is not None:
+            return cached
+        spec_dict = parse_spec(data, job.path)
+        content_hash = spec_hash(spec_dict)
+        self.spec_cache.set(key, spec_dict, content_hash)
+        return spec_dict, content_hash
+
+    def __validate(self, job, spec_dict):
+        ''' Private Function to check if the file is a valid 3.0/3.1 openapi_file on the level of the job,
+            every spec is only validated once per level '''
+        level = job.validation_level or self.validation
+        start = time.monotonic()
+        result = self.spec_cache.get_validation(job.spec_hash, level)
+        cached = result is not None
+        if not cached:
+            try:
+                validate_spec(spec_dict, level)
+                result = {'valid': True, 'error': None}
+            except ValueError as error:
+                result = {'valid': False, 'error': str(error)}
+            self.spec_cache.set_validation(job.spec_hash, level, result['error'])
+        job.validation = {'level': level, 'cached': cached, 'seconds': round(time.monotonic() - start, 3)}
+        if not result['valid']:
+            raise ValueError(result['error'])
+
+    def __ingest(self, job, spec_dict):
+        ''' Private Function to create the Object Endpoint Dependency Graph '''
+        gg = GraphGenerator(spec_dict, job.spec_hash, self.backend)
+        gg.create_graph()
+
+    def __update(self, job, spec_dict):
+        ''' Private Function to update the graph in the fixed namespace of the job with only the changes. Returns the diff '''
+        gg = GraphGenerator(spec_dict, job.namespace, self.backend)
+        return gg.update_graph()
+
+    def __sequence(self, job, previous_hash=None):
+        ''' Private Function to generate the testing templates and cache them. Endpoints which did not change since the
+            results of previous_hash are taken from them. Returns the number of created endpoint entries '''
+        previous = self.__previous_results(previous_hash) if previous_hash is not None else None
+        sg = SequenceGenerator(job.graph_id, self.backend, executor=self.sequence_pool, previous=previous, max_depth=self.property_depth)
+        # The endpoint_list is written to the cache while it is created
+        results, endpoint_list = sg.iter_results()
+        self.result_cache.set(self.__result_key(job.spec_hash), results, endpoint_list)
+        return len(sg.recomputed)
+
+    def __previous_results(self, previous_hash):
+        ''' Private Function to get the cached results of the previous upload of a namespace with their endpoint_list.
+            Returns None if they are not cached anymore '''
+        previous = self.result_cache.get(self.__result_key(previous_hash))
+        endpoint_list = self.result_cache.endpoint_list(self.__result_key(previous_hash))
+        if previous is None or endpoint_list is None:
+            return None
+        return dict(previous, endpoint_list=dict(endpoint_list))
+
+    def __result_key(self, spec_hash):
+        ''' Private Function to get the result cache key of a spec hash with the property depth of the app '''
+        return result_key(spec_hash, self.property_depth)
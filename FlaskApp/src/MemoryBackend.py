@@ -0,0 +1,132 @@
+import threading
+
+from . import metrics
+from .GraphBackend import GraphBackend
+from .GraphSnapshot import GraphSnapshot
+from .graphdiff import ROW_KEYS, row_key, relationship_row
+
+class MemoryBackend(GraphBackend):
+    def __init__(self):
+        ''' Init Function '''
+        # Graphs by spec namespace, each with its nodes indexed by label and name and its relationships
+        self.graphs = {}
+        self.lock = threading.Lock()
+
+    def delete_graph(self, spec_id):
+        ''' Function to delete all nodes and relationships of a spec namespace '''
+        with self.lock:
+            self.graphs.pop(spec_id, None)
+
+    def write_graph(self, spec_id, graph):
+        ''' Function to write the collected graph, it becomes visible at once like a committed transaction '''
+        with metrics.stage("ingest_nodes"):
+            nodes = self.__nodes(spec_id, graph)
+
+        with metrics.stage("ingest_edges"):
+            relationships = self.__relationships(spec_id, graph, nodes)
+
+        with self.lock:
+            self.graphs[spec_id] = {'nodes': nodes, 'relationships': relationships}
+
+    def update_graph(self, spec_id, diff):
+        ''' Function to apply a diff to a spec namespace, the changed graph becomes visible at once like a committed transaction.
+            Nodes and relationships are kept in the row order of the new graph, so the graph equals a fresh write_graph '''
+        with self.lock:
+            stored = self.graphs[spec_id]
+
+        # Rows of the stored nodes and relationships and of the added ones by their key
+        rows = {part: {} for part in ROW_KEYS}
+        for object_name in stored['nodes']['Object']:
+            rows['objects'][(object_name,)] = {'name': object_name}
+        for endpoint in stored['nodes']['Endpoint'].values():
+            rows['endpoints'][row_key('endpoints', endpoint)] = endpoint
+        for relationship in stored['relationships']:
+            part, row = relationship_row(relationship)
+            rows[part][row_key(part, row)] = row
+        for part, added_rows in diff['added'].items():
+            for row in added_rows:
+                rows[part][row_key(part, row)] = row
+
+        # The new graph in its row order, removed rows are not part of it
+        graph = {part: [rows[part][key] for key in keys] for part, keys in diff['order'].items()}
+        graph['info'] = diff['info'] if diff['info'] is not None else next(iter(stored['nodes']['OpenAPIFile'].values()))
+        nodes = self.__nodes(spec_id, graph)
+        relationships = self.__relationships(spec_id, graph, nodes)
+
+        with self.lock:
+            self.graphs[spec_id] = {'nodes': nodes, 'relationships': relationships}
+
+    def __nodes(self, spec_id, graph):
+        ''' Private Function to create the nodes of the collected rows indexed by label and name '''
+        nodes = {
+            'OpenAPIFile': {graph['info']['name']: dict(graph['info'], spec=spec_id)},
+            'Object': {},
+            'Endpoint': {}
+        }
+        for row in graph['objects']:
+            self.__add_node(nodes, 'Object', {'spec': spec_id, 'name': row['name']})
+        for row in graph['endpoints']:
+            self.__add_node(nodes, 'Endpoint', dict(row, spec=spec_id))
+        return nodes
+
+    def __relationships(self, spec_id, graph, nodes):
+        ''' Private Function to create the relationships of the collected rows whose nodes exist '''
+        relationships = []
+        for row in graph['has_property']:
+            if row['from'] in nodes['Object'] and row['to'] in nodes['Object']:
+                relationships.append({
+                    'type': "HAS_PROPERTY",
+                    'start': row['from'],
+                    'end': row['to'],
+                    'properties': {'spec': spec_id, 'name': row['name'], 'list': row['list']}
+                })
+
+        # Connections are kept in endpoint order, for each endpoint request body, parameters and responses
+        connections = {endpoint_name: [] for endpoint_name in nodes['Endpoint']}
+        for row in graph['request_body']:
+            connections.get(row['endpoint'], []).append({
+                'type': "IN_REQUEST_BODY",
+                'start': row['object'],
+                'end': row['endpoint'],
+                'properties': {'spec': spec_id}
+            })
+        for row in graph['parameters']:
+            connections.get(row['endpoint'], []).append({
+                'type': "IS_PARAMETER",
+                'start': row['object'],
+                'end': row['endpoint'],
+                'properties': {'spec': spec_id, 'parameter_name': row['parameter_name'], 'property_name': row['property_name']}
+            })
+        for row in graph['responses']:
+            connections.get(row['endpoint'], []).append({
+                'type': "IN_RESPONSE_BODY",
+                'start': row['endpoint'],
+                'end': row['object'],
+                'properties': {'spec': spec_id, 'status_code': row['status_code']}
+            })
+        for endpoint_connections in connections.values():
+            for relationship in endpoint_connections:
+                object_name = relationship['end'] if relationship['type'] == "IN_RESPONSE_BODY" else relationship['start']
+                if object_name in nodes['Object']:
+                    relationships.append(relationship)
+        return relationships
+
+    def load_graph(self, spec_id):
+        ''' Function to get the graph of a spec namespace. Returns an empty snapshot for unknown namespaces '''
+        with self.lock:
+            stored = self.graphs.get(spec_id)
+        if stored is None:
+            return GraphSnapshot({}, [], {}, [])
+
+        info = next(iter(stored['nodes']['OpenAPIFile'].values()))
+        endpoints = {
+            endpoint_name: {'path': endpoint['path'], 'operation': endpoint['operation']}
+            for endpoint_name, endpoint in stored['nodes']['Endpoint'].items()
+        }
+        return GraphSnapshot(info, list(stored['nodes']['Object']), endpoints, stored['relationships'])
+
+    def __add_node(self, nodes, label, properties):
+        ''' Private Function to add a node to the name index of its label, names are unique like in the neo4j schema '''
+        if properties['name'] in nodes[label]:
+            raise ValueError(f'{label} {properties["name"]} already exists')
+        nodes[label][properties['name']] = properties
@@ -0,0 +1,219 @@
+import time
+
+from neo4j import GraphDatabase
+
+from . import metrics
+from .GraphBackend import GraphBackend
+from .GraphSnapshot import GraphSnapshot
+from .database import prepare, delete_spec, explain_lookups, execute_query, run_query, DATABASE
+
+# Statements to create the rows of every part of a collected graph, in the order they have to run
+CREATE_QUERIES = {
+    'objects': """
+        UNWIND $rows AS row
+        CREATE (:Object {spec: $spec, name: row.name})
+        """,
+    'has_property': """
+        UNWIND $rows AS row
+        MATCH (o1:Object {spec: $spec, name: row.from})
+        MATCH (o2:Object {spec: $spec, name: row.to})
+        CREATE (o1)-[:HAS_PROPERTY {spec: $spec, name: row.name, list: row.list}]->(o2)
+        """,
+    'endpoints': """
+        UNWIND $rows AS row
+        CREATE (:Endpoint {spec: $spec, name: row.name, path: row.path, operation: row.operation})
+        """,
+    'request_body': """
+        UNWIND $rows AS row
+        MATCH (e:Endpoint {spec: $spec, name: row.endpoint})
+        MATCH (o:Object {spec: $spec, name: row.object})
+        CREATE (o)-[:IN_REQUEST_BODY {spec: $spec}]->(e)
+        """,
+    'parameters': """
+        UNWIND $rows AS row
+        MATCH (e:Endpoint {spec: $spec, name: row.endpoint})
+        MATCH (o:Object {spec: $spec, name: row.object})
+        CREATE (o)-[:IS_PARAMETER {spec: $spec, parameter_name: row.parameter_name, property_name: row.property_name}]->(e)
+        """,
+    'responses': """
+        UNWIND $rows AS row
+        MATCH (e:Endpoint {spec: $spec, name: row.endpoint})
+        MATCH (o:Object {spec: $spec, name: row.object})
+        CREATE (e)-[:IN_RESPONSE_BODY {spec: $spec, status_code: row.status_code}]->(o)
+        """,
+}
+
+# Parts of a collected graph which are nodes, all others are connections
+NODE_PARTS = {'objects', 'endpoints'}
+
+# Statements to delete the rows of every part, connections before nodes
+DELETE_QUERIES = {
+    'has_property': """
+        UNWIND $rows AS row
+        MATCH (:Object {spec: $spec, name: row.from})-[r:HAS_PROPERTY {name: row.name, list: row.list}]->(:Object {spec: $spec, name: row.to})
+        DELETE r
+        """,
+    'request_body': """
+        UNWIND $rows AS row
+        MATCH (:Object {spec: $spec, name: row.object})-[r:IN_REQUEST_BODY]->(:Endpoint {spec: $spec, name: row.endpoint})
+        DELETE r
+        """,
+    'parameters': """
+        UNWIND $rows AS row
+        MATCH (:Object {spec: $spec, name: row.object})-[r:IS_PARAMETER {parameter_name: row.parameter_name, property_name: row.property_name}]->(:Endpoint {spec: $spec, name: row.endpoint})
+        DELETE r
+        """,
+    'responses': """
+        UNWIND $rows AS row
+        MATCH (:Endpoint {spec: $spec, name: row.endpoint})-[r:IN_RESPONSE_BODY {status_code: row.status_code}]->(:Object {spec: $spec, name: row.object})
+        DELETE r
+        """,
+    'objects': """
+        UNWIND $rows AS row
+        MATCH (n:Object {spec: $spec, name: row.name})
+        DETACH DELETE n
+        """,
+    'endpoints': """
+        UNWIND $rows AS row
+        MATCH (n:Endpoint {spec: $spec, name: row.name})
+        DETACH DELETE n
+        """,
+}
+
+class Neo4jBackend(GraphBackend):
+    def __init__(self, driver, database=DATABASE, batch_size=1000):
+        ''' Init Function '''
+        # Shared pooled driver, all operations borrow sessions from it
+        self.driver = driver
+        self.database = database
+        # Number of rows written per UNWIND statement
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_config(cls, config):
+        ''' Function to create the backend with a new driver from the app config '''
+        driver = GraphDatabase.driver(
+            config['NEO4J_URI'],
+            max_connection_pool_size=config['NEO4J_MAX_POOL_SIZE'],
+            connection_acquisition_timeout=config['NEO4J_ACQUISITION_TIMEOUT']
+        )
+        return cls(driver, config['NEO4J_DATABASE'], config['NEO4J_BATCH_SIZE'])
+
+    def delete_graph(self, spec_id):
+        ''' Function to delete all nodes and relationships of a spec namespace in batches '''
+        prepare(self.driver, self.database)
+        delete_spec(self.driver, spec_id, self.database, self.batch_size)
+
+    def write_graph(self, spec_id, graph):
+        ''' Function to write the whole graph in one transaction with batched UNWIND statements '''
+        prepare(self.driver, self.database)
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self.__write_graph, spec_id, graph)
+
+    def update_graph(self, spec_id, diff):
+        ''' Function to apply a diff in one transaction, only the changed nodes and relationships are touched '''
+        prepare(self.driver, self.database)
+        with self.driver.session(database=self.database) as session:
+            session.execute_write(self.__update_graph, spec_id, diff)
+
+    def load_graph(self, spec_id):
+        ''' Function to load the graph of one spec namespace with one query for the nodes and one for the relationships '''
+        prepare(self.driver, self.database)
+        # Only the needed properties are returned as scalar columns, no property map is built per node
+        nodes, summary, keys = execute_query(self.driver, "load_nodes", """
+            MATCH (n:OpenAPIFile {spec: $spec})
+            RETURN 'OpenAPIFile' AS label, n.name AS name, n.version AS version, n.openapi_version AS openapi_version, null AS path, null AS operation
+            UNION ALL
+            MATCH (n:Object {spec: $spec})
+            RETURN 'Object' AS label, n.name AS name, null AS version, null AS openapi_version, null AS path, null AS operation
+            UNION ALL
+            MATCH (n:Endpoint {spec: $spec})
+            RETURN 'Endpoint' AS label, n.name AS name, null AS version, null AS openapi_version, n.path AS path, n.operation AS operation
+            """,
+            spec=spec_id,
+            database_=self.database
+        )
+        # Every relationship touches an Object, HAS_PROPERTY is only taken from its start Object
+        relationships, summary, keys = execute_query(self.driver, "load_relationships", """
+            MATCH (o:Object {spec: $spec})-[r]-(:Endpoint)
+            RETURN type(r) AS type, startNode(r).name AS start, endNode(r).name AS end, properties(r) AS properties
+            UNION ALL
+            MATCH (o:Object {spec: $spec})-[r:HAS_PROPERTY]->(:Object)
+            RETURN type(r) AS type, startNode(r).name AS start, endNode(r).name AS end, properties(r) AS properties
+            """,
+            spec=spec_id,
+            database_=self.database
+        )
+
+        info = {}
+        objects = []
+        endpoints = {}
+        for node in nodes:
+            if node['label'] == "OpenAPIFile":
+                info = {
+                    'name': node['name'],
+                    'version': node['version'],
+                    'openapi_version': node['openapi_version']
+                }
+            elif node['label'] == "Object":
+                objects.append(node['name'])
+            elif node['label'] == "Endpoint":
+                endpoints[node['name']] = {
+                    'path': node['path'],
+                    'operation': node['operation']
+                }
+
+        return GraphSnapshot(info, objects, endpoints, [relationship.data() for relationship in relationships])
+
+    def explain_lookups(self):
+        ''' Function to check which lookups are planned with an index seek '''
+        prepare(self.driver, self.database)
+        return explain_lookups(self.driver, self.database)
+
+    def close(self):
+        ''' Function to close the driver and its connection pool '''
+        self.driver.close()
+
+    def __write_graph(self, tx, spec_id, graph):
+        ''' Private Function to write the collected graph inside a transaction '''
+        start = time.perf_counter()
+        run_query(
+            tx,
+            "create_info",
+            "CREATE (:OpenAPIFile {spec: $spec, name: $name, version: $version, openapi_version: $openapi_version})",
+            spec=spec_id,
+            name=graph['info']['name'],
+            version=graph['info']['version'],
+            openapi_version=graph['info']['openapi_version']
+        )
+        seconds = {'ingest_nodes': time.perf_counter() - start, 'ingest_edges': 0.0}
+        # Nodes have to exist before the connections can be matched
+        for part, query in CREATE_QUERIES.items():
+            start = time.perf_counter()
+            self.__run_batched(tx, spec_id, graph[part], query, f'create_{part}')
+            seconds['ingest_nodes' if part in NODE_PARTS else 'ingest_edges'] += time.perf_counter() - start
+        for stage, stage_seconds in seconds.items():
+            metrics.record_stage(stage, stage_seconds)
+
+    def __update_graph(self, tx, spec_id, diff):
+        ''' Private Function to apply a diff inside a transaction '''
+        if diff['info'] is not None:
+            run_query(
+                tx,
+                "update_info",
+                "MATCH (f:OpenAPIFile {spec: $spec}) SET f.name = $name, f.version = $version, f.openapi_version = $openapi_version",
+                spec=spec_id,
+                name=diff['info']['name'],
+                version=diff['info']['version'],
+                openapi_version=diff['info']['openapi_version']
+            )
+        # Connections first, then the nodes with all their remaining connections
+        for part, query in DELETE_QUERIES.items():
+            self.__run_batched(tx, spec_id, diff['removed'][part], query, f'delete_{part}')
+        for part, query in CREATE_QUERIES.items():
+            self.__run_batched(tx, spec_id, diff['added'][part], query, f'create_{part}')
+
+    def __run_batched(self, tx, spec_id, rows, query, metric):
+        ''' Private Function to run a UNWIND query with the rows split into batches of batch_size '''
+        for start in range(0, len(rows), self.batch_size):
+            run_query(tx, metric, query, spec=spec_id, rows=rows[start:start + self.batch_size])
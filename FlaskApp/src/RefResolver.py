@@ -0,0 +1,175 @@
+from urllib.parse import unquote
+
+SCHEMA_PREFIX = "#/components/schemas/"
+COMBINATIONS = ["allOf", "oneOf", "anyOf"]
+
+class RefResolver():
+    def __init__(self, spec_data):
+        ''' Init Function '''
+        self.spec_data = spec_data
+        self.schemas = spec_data.get("components", {}).get("schemas", {}) if isinstance(spec_data, dict) else {}
+        if not isinstance(self.schemas, dict):
+            self.schemas = {}
+
+        # All Objects by name, the component schemas first and the nested inline objects as they are found
+        self.objects = dict(self.schemas)
+        self.object_names = list(self.schemas)
+
+        # Memoised results, refs by their string and schemas by their id, so every subtree is only walked once
+        self.refs = {}
+        self.merged_properties = {}
+        self.referenced_objects = {}
+        # Schemas which are walked at the moment, to stop at cycles
+        self.in_progress = set()
+
+    def resolve(self, node):
+        ''' Function to follow $ref until a node without $ref is reached. Returns {} for unknown, external or cyclic refs '''
+        seen = []
+        while isinstance(node, dict) and "$ref" in node:
+            ref = node["$ref"]
+            if ref in self.refs:
+                node = self.refs[ref]
+                break
+            if ref in seen:
+                node = {}
+                break
+            seen.append(ref)
+            node = self.__lookup(ref)
+
+        if not isinstance(node, dict):
+            node = {}
+        for ref in seen:
+            self.refs[ref] = node
+        return node
+
+    def properties(self, schema):
+        ''' Function to get all properties of a schema, including the properties of its refs and allOf parts '''
+        schema = self.resolve(schema)
+        key = ("properties", id(schema))
+        if key in self.merged_properties:
+            return self.merged_properties[key]
+        if key in self.in_progress:
+            return {}
+
+        self.in_progress.add(key)
+        properties = {}
+        for part in schema.get("allOf", []):
+            properties.update(self.properties(part))
+        own_properties = schema.get("properties", {})
+        if isinstance(own_properties, dict):
+            properties.update(own_properties)
+        self.in_progress.discard(key)
+
+        self.merged_properties[key] = properties
+        return properties
+
+    def iter_object_properties(self):
+        ''' Generator for all Objects with their property connections, yields (object name, list of rows).
+            Nested inline objects are added to the Objects while iterating and are yielded too '''
+        index = 0
+        while index < len(self.object_names):
+            object_name = self.object_names[index]
+            rows = []
+            for property_name, property_details in self.properties(self.objects[object_name]).items():
+                for target, is_list in self.property_targets(object_name, property_name, property_details):
+                    rows.append({
+                        'from': object_name,
+                        'to': target,
+                        'name': property_name,
+                        'list': is_list
+                    })
+            yield object_name, rows
+            index = index + 1
+
+    def property_targets(self, owner, property_name, property_details, is_list=False):
+        ''' Function to get the Objects a property points to as list of (object name, is list).
+            Inline objects get the name "<owner>.<property>" '''
+        if not isinstance(property_details, dict):
+            return []
+
+        ref = property_details.get("$ref")
+        if isinstance(ref, str):
+            object_name = self.__object_name(ref)
+            if object_name is not None:
+                return [(object_name, is_list)]
+            return self.property_targets(owner, property_name, self.resolve(property_details), is_list)
+
+        # Inline object with own properties
+        if "properties" in property_details:
+            object_name = f'{owner}.{property_name}'
+            if object_name not in self.objects:
+                self.objects[object_name] = property_details
+                self.object_names.append(object_name)
+            return [(object_name, is_list)]
+
+        key = ("targets", id(property_details))
+        if key in self.in_progress:
+            return []
+
+        self.in_progress.add(key)
+        targets = []
+        if "items" in property_details:
+            targets.extend(self.property_targets(owner, property_name, property_details["items"], True))
+        for combination in COMBINATIONS:
+            for part in property_details.get(combination, []):
+                for target in self.property_targets(owner, property_name, part, is_list):
+                    if target not in targets:
+                        targets.append(target)
+        self.in_progress.discard(key)
+        return targets
+
+    def schema_objects(self, schema):
+        ''' Function to get all Objects a content schema refers to, through refs, items, allOf/oneOf/anyOf and inline properties '''
+        if not isinstance(schema, dict):
+            return []
+
+        ref = schema.get("$ref")
+        if isinstance(ref, str):
+            object_name = self.__object_name(ref)
+            if object_name is not None:
+                return [object_name]
+            return self.schema_objects(self.resolve(schema))
+
+        key = ("objects", id(schema))
+        if key in self.referenced_objects:
+            return self.referenced_objects[key]
+        if key in self.in_progress:
+            return []
+
+        self.in_progress.add(key)
+        parts = [schema.get("items")]
+        for combination in COMBINATIONS:
+            parts.extend(schema.get(combination, []))
+        properties = schema.get("properties", {})
+        if isinstance(properties, dict):
+            parts.extend(properties.values())
+        objects = []
+        for part in parts:
+            for object_name in self.schema_objects(part):
+                if object_name not in objects:
+                    objects.append(object_name)
+        self.in_progress.discard(key)
+
+        self.referenced_objects[key] = objects
+        return objects
+
+    def __object_name(self, ref):
+        ''' Private Function to get the Object name of a ref to a component schema, None for all other refs '''
+        if ref.startswith(SCHEMA_PREFIX) and "/" not in ref[21:]:
+            return unquote(ref[21:]).replace("~1", "/").replace("~0", "~")
+        return None
+
+    def __lookup(self, ref):
+        ''' Private Function to get the node of a local ref like #/components/parameters/limit '''
+        if not ref.startswith("#"):
+            return {}
+        node = self.spec_data
+        for token in ref[1:].split("/")[1:]:
+            token = unquote(token).replace("~1", "/").replace("~0", "~")
+            if isinstance(node, dict) and token in node:
+                node = node[token]
+            elif isinstance(node, list) and token.isdigit() and int(token) < len(node):
+                node = node[int(token)]
+            else:
+                return {}
+        return node
@@ -0,0 +1,159 @@
+from collections import OrderedDict
+import hashlib
+import json
+import os
+import threading
+
+from .export import ndjson_chunks
+
+_ENDPOINT_PREFIX = '{"endpoint": '
+_decoder = json.JSONDecoder()
+
+def spec_hash(spec_dict):
+    ''' Function to get the content hash of a parsed OpenAPI File, independent of key order and formatting '''
+    normalised = json.dumps(spec_dict, sort_keys=True, separators=(',', ':'), default=str)
+    return hashlib.sha256(normalised.encode("utf-8")).hexdigest()
+
+def result_key(spec_hash, max_depth):
+    ''' Function to get the cache key of the results of a spec, which depend on the property depth of its Objects '''
+    # No dots, the disk tier gets the key of a file from the part before the first dot
+    return spec_hash if max_depth is None else f'{spec_hash}-depth{max_depth}'
+
+class ResultCache():
+    def __init__(self, directory, max_items=32, max_disk_bytes=512 * 1024 * 1024):
+        ''' Init Function '''
+        # In-memory LRU tier with at most max_items results, without their endpoint_list
+        self.max_items = max_items
+        self.memory = OrderedDict()
+
+        # On-disk tier with one json file per result and one ndjson file with its endpoint_list, the least recently used
+        # results are removed above max_disk_bytes
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        os.makedirs(self.directory, exist_ok=True)
+
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        ''' Function to get the cached results for a spec hash without the endpoint_list, which is read with endpoint_list.
+            Returns None if nothing is cached '''
+        with self.lock:
+            if key in self.memory:
+                self.memory.move_to_end(key)
+                return self.memory[key]
+
+        # Fall back to the disk tier and promote the result into memory
+        path = self.__path(key)
+        try:
+            with open(path, "r") as file:
+                value = json.load(file)
+            os.utime(path)
+            os.utime(self.__endpoint_path(key))
+        except (OSError, ValueError):
+            return None
+        self.__remember(key, value)
+        return value
+
+    def set(self, key, value, endpoint_list):
+        ''' Function to cache the results for a spec hash. The (endpoint name, entry) items of the endpoint_list are written
+            to disk one by one while they are created, only the other parts are kept in memory '''
+        # Write to temporary files first, so readers never see a partial file. The results are written last,
+        # so they only exist together with their endpoint_list
+        endpoint_path = self.__endpoint_path(key)
+        temporary_path = f'{endpoint_path}.{threading.get_ident()}.tmp'
+        with open(temporary_path, "w") as file:
+            for chunk in ndjson_chunks(endpoint_list):
+                file.write(chunk)
+        os.replace(temporary_path, endpoint_path)
+
+        path = self.__path(key)
+        temporary_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(temporary_path, "w") as file:
+            json.dump(value, file)
+        os.replace(temporary_path, path)
+
+        self.__remember(key, value)
+        self.__evict_disk(key)
+
+    def endpoint_list(self, key):
+        ''' Function to get a generator for the (endpoint name, entry) items of a cached endpoint_list, which reads the file
+            line by line. Returns None if it is not cached '''
+        try:
+            file = open(self.__endpoint_path(key), "r")
+        except OSError:
+            return None
+        return _endpoint_items(file)
+
+    def endpoint_entries(self, key, endpoint_names):
+        ''' Function to get the entries of only the given endpoints from a cached endpoint_list. Only the endpoint name of a line
+            is decoded before its entry, and the file is only read until all endpoints are found. Returns None if it is not cached '''
+        try:
+            file = open(self.__endpoint_path(key), "r")
+        except OSError:
+            return None
+        wanted = set(endpoint_names)
+        entries = {}
+        with file:
+            for line in file:
+                if len(entries) == len(wanted):
+                    break
+                if _endpoint_name(line) in wanted:
+                    entry = json.loads(line)
+                    entries[entry.pop("endpoint")] = entry
+        return entries
+
+    def __remember(self, key, value):
+        ''' Private Function to put a result into the memory tier and drop the least recently used ones '''
+        with self.lock:
+            self.memory[key] = value
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_items:
+                self.memory.popitem(last=False)
+
+    def __evict_disk(self, keep):
+        ''' Private Function to remove the least recently used results until the disk tier fits into max_disk_bytes.
+            The result keep was just written and is never removed, even if it is larger than max_disk_bytes on its own '''
+        # Size and last use of every result, its two files are always removed together
+        results = {}
+        for entry in os.scandir(self.directory):
+            if entry.name.endswith((".json", ".ndjson")):
+                stat = entry.stat()
+                key = entry.name.split(".")[0]
+                mtime, size = results.get(key, (0, 0))
+                results[key] = (max(mtime, stat.st_mtime), size + stat.st_size)
+
+        total_size = sum(size for mtime, size in results.values())
+        for key, (mtime, size) in sorted(results.items(), key=lambda item: item[1]):
+            if total_size <= self.max_disk_bytes:
+                break
+            if key == keep:
+                continue
+            with self.lock:
+                self.memory.pop(key, None)
+            for path in (self.__path(key), self.__endpoint_path(key)):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total_size = total_size - size
+
+    def __path(self, key):
+        ''' Private Function to get the file path for a spec hash '''
+        return os.path.join(self.directory, f'{key}.json')
+
+    def __endpoint_path(self, key):
+        ''' Private Function to get the file path of the endpoint_list for a spec hash '''
+        return os.path.join(self.directory, f'{key}.endpoints.ndjson')
+
+def _endpoint_name(line):
+    ''' Function to decode only the endpoint name at the start of an endpoint_list line, which ndjson_chunks writes first '''
+    if not line.startswith(_ENDPOINT_PREFIX):
+        return None
+    return _decoder.raw_decode(line, len(_ENDPOINT_PREFIX))[0]
+
+def _endpoint_items(file):
+    ''' Generator for the (endpoint name, entry) items of an endpoint_list file, the file is closed at the end '''
+    with file:
+        for line in file:
+            entry = json.loads(line)
+            yield entry.pop("endpoint"), entry
@@ -1,44 +1,123 @@
-from neo4j import GraphDatabase
-from itertools import permutations
+import hashlib
+import json
 import math
+import time
 
-URI = "bolt://neo4j:7687/"
+from . import metrics
+from .sequences import ordering_counter, endpoint_entry, sequence_groups
 
 class SequenceGenerator():
-    def __init__(self):
+    def __init__(self, spec_id, backend, max_orderings=None, count_only=False, factorised=False, executor=None, previous=None, max_depth=None):
         ''' Init Function '''
-        # Connect to neo4j GraphDatabase 
-        self.driver = GraphDatabase.driver(URI)
-        self.database = "neo4j"
-        self.driver.verify_connectivity()
+        # Namespace of the graph in the database
+        self.spec_id = spec_id
+        # Maximum number of object orders used for the sequences of one endpoint (None = all)
+        self.max_orderings = max_orderings
+        # Maximum number of Objects and cycles on a HAS_PROPERTY path of a connected Object (None = all)
+        self.max_depth = max_depth
+        # Only count the object orders and calculate the sequence_length of all orders without creating the sequences
+        self.count_only = count_only
+        # Save preparation and dismantling per object order as objects with their alternative endpoints instead of all sequences
+        self.factorised = factorised
+        # Process pool for the endpoint_list, without one all endpoints are created in this process
+        self.executor = executor
+        # Results of an earlier version of the spec, endpoints with an unchanged task take their entry from them
+        self.previous = previous
+
+        # Storage backend (neo4j or in-memory) with the graph
+        self.backend = backend
 
         # Init class variables 
+        self.graph = None
         self.object_crud = None
         self.object_list = None
         self.endpoint_list = None
+        # Memoised create/delete role of every endpoint as (object name, "create"/"delete"), object_crud entry and dependencies
+        # of every Object and endpoint_list entry of every requested endpoint, so single endpoints only resolve what they need
+        self.crud_endpoints = {}
+        self.object_crud_entries = {}
+        self.object_dependencies = {}
+        self.endpoint_sequences = {}
+        # Fingerprint of the task of every endpoint and the endpoints whose entry was created and not taken from previous
+        self.fingerprints = {}
+        self.recomputed = []
+        # Duration in seconds of loading the graph and of every created template
+        self.durations = {}
         
-    def get_infos(self):
-        ''' Function to get all generic informations about the API and generate the testing templates '''
-        # Get informations from OpenAPIFile Node from datebase
-        records, summary, keys = self.driver.execute_query(
-            "MATCH (f:OpenAPIFile) RETURN f"
-        )
-        
-        # Call private functions which create and return the testing templates
-        self.object_list = self.__set_object_list()
-        self.object_crud = self.__set_object_crud()
-        self.endpoint_list = self.__set_endpoint_list()
+    def get_infos(self, endpoint_list=True):
+        ''' Function to get all generic informations about the API and generate the testing templates.
+            Without endpoint_list the endpoints can be generated one by one with iter_endpoint_list '''
+        self.__load_graph()
 
-        # Close neo4j driver connection
-        self.driver.close()
+        # Call private functions which create and return the testing templates
+        self.object_list = self.__timed("object_list", self.__set_object_list)
+        self.object_crud = self.__timed("object_crud", self.__set_object_crud)
+        if endpoint_list:
+            self.endpoint_list = self.__timed("endpoint_list", self.__set_endpoint_list)
 
         # Return generic informations about API
+        return self.get_api_info()
+
+    def get_api_info(self):
+        ''' Function to get only the generic informations about the API, without creating any testing template '''
+        self.__load_graph()
         return {
-            'name': records[0].data()['f']['name'],
-            'version': records[0].data()['f']['version'],
-            'openapi_version': records[0].data()['f']['openapi_version'],
+            'name': self.graph.info['name'],
+            'version': self.graph.info['version'],
+            'openapi_version': self.graph.info['openapi_version'],
         }
         
+    def __load_graph(self):
+        ''' Private function to load the whole graph from the database once, all templates are created from this snapshot '''
+        if self.graph is None:
+            graph = self.__timed("load", self.backend.load_graph, self.spec_id)
+            if not graph.info:
+                raise LookupError(f'No graph exists for the spec {self.spec_id}')
+            self.graph = graph
+
+    def get_endpoint_sequences(self, endpoint_names):
+        ''' Function to get the endpoint_list entries of only the given endpoints, without creating the templates of the whole API.
+            Only the object_crud entries of the connected Objects are created and every entry is memoised. Raises KeyError for unknown endpoints '''
+        self.__load_graph()
+        result = {}
+        for endpoint_name in endpoint_names:
+            if endpoint_name not in self.graph.endpoints:
+                raise KeyError(endpoint_name)
+            if endpoint_name not in self.endpoint_sequences:
+                self.endpoint_sequences[endpoint_name] = endpoint_entry(self.__endpoint_task(endpoint_name))
+            result[endpoint_name] = self.endpoint_sequences[endpoint_name]
+        return result
+
+    def __timed(self, step, function, *args):
+        ''' Private function to run one step and save its duration '''
+        start = time.perf_counter()
+        result = function(*args)
+        self.durations[step] = time.perf_counter() - start
+        metrics.record_stage(step, self.durations[step])
+        return result
+
+    def get_results(self):
+        ''' Function to generate the testing templates and get them together with the generic informations '''
+        return {
+            'info': self.get_infos(),
+            'object_list': self.object_list,
+            'object_crud': self.object_crud,
+            'endpoint_list': self.endpoint_list,
+            'fingerprints': self.fingerprints
+        }
+
+    def iter_results(self):
+        ''' Function to get the generic informations and the object templates together with a generator for the endpoint_list,
+            so the endpoint_list never has to be kept in memory. The fingerprints are complete once the generator is exhausted '''
+        info = self.get_infos(endpoint_list=False)
+        results = {
+            'info': info,
+            'object_list': self.object_list,
+            'object_crud': self.object_crud,
+            'fingerprints': self.fingerprints
+        }
+        return results, metrics.timed_chunks("endpoint_list", self.iter_endpoint_list(), self.durations)
+
     def get_object_list(self):
         ''' Get function for object_list dictionary'''
         return self.object_list
@@ -53,275 +132,245 @@ class SequenceGenerator():
 
     def __set_object_list(self):
         ''' Private function to set the object_list dictionary '''
-        # Get informations from all Object Nodes from database
-        all_objects, summary, keys = self.driver.execute_query(
-            "MATCH (o:Object) RETURN o",
-        )
-        # Get informations from all Endpoint Nodes from database
-        all_endpoints, summary, keys = self.driver.execute_query(
-            "MATCH (e:Endpoint) RETURN e",
-        )
-
         # Init result variable 
         result = {}
         # Init variable which stores all endpoints that have been used from at leatst one object
-        finished_endpoints_all = []
+        finished_endpoints_all = set()
         # Iterate through all objects and search for all endpoints where are directly used
-        for object in all_objects:
-            # Get all related Endpoint Nodes with informations about the relationship
-            endpoints, summary, keys = self.driver.execute_query(
-                "MATCH (e:Endpoint)-[r]-(o:Object {name: $name}) RETURN e, r, PROPERTIES(r)",
-                name=object.data()['o']['name']
-            )
+        for object_name in self.graph.objects:
             # Init object name as key in result
-            result[object.data()['o']['name']] = {}
-            # Iterate through all endpoints with relationship which are found
-            for endpoint in endpoints:
+            result[object_name] = {}
+            # Iterate through all related endpoints with informations about the relationship
+            for relationship in self.graph.object_relationships[object_name]:
                 # Check if the endpoint is already in the dictionary from this object
-                if endpoint.data()['e']['name'] not in result[object.data()['o']['name']].keys():
-                    result[object.data()['o']['name']][endpoint.data()['e']['name']] = []
+                if relationship['endpoint'] not in result[object_name]:
+                    result[object_name][relationship['endpoint']] = []
 
                 # if the relationship is from request-body save only the name
-                if endpoint.data()['r'][1] == "IN_REQUEST_BODY":
-                    info = f'{endpoint.data().get("r")[1]}'
+                if relationship['type'] == "IN_REQUEST_BODY":
+                    info = f'{relationship["type"]}'
                 # if the relationship is from response-body save the name and the status code
-                elif endpoint.data()['r'][1] == "IN_RESPONSE_BODY":
-                    info = f'{endpoint.data()['r'][1]} - {endpoint.data()['PROPERTIES(r)']['status_code']}'
+                elif relationship['type'] == "IN_RESPONSE_BODY":
+                    info = f'{relationship["type"]} - {relationship["properties"]["status_code"]}'
                     # if the relationship is from a parameter save the name and the parameter namen and if not equal the property name too
-                elif endpoint.data()['r'][1] == "IS_PARAMETER":
-                    info = f'{endpoint.data()['r'][1]} - {endpoint.data()['PROPERTIES(r)']['parameter_name']} - {endpoint.data()['PROPERTIES(r)']['property_name']}'
+                elif relationship['type'] == "IS_PARAMETER":
+                    info = f'{relationship["type"]} - {relationship["properties"]["parameter_name"]} - {relationship["properties"]["property_name"]}'
                 
                 # add info to list
-                result[object.data()['o']['name']][endpoint.data()['e']['name']].append(info)
+                result[object_name][relationship['endpoint']].append(info)
                 # add endpoint name to finished endpoints list
-                finished_endpoints_all.append(endpoint.data()['e']['name'])
+                finished_endpoints_all.add(relationship['endpoint'])
 
-        # Save all Endpoints which are never used one time in this list
-        result["NO_OBJECT"] = []
-        for endpoint in all_endpoints:
-            if endpoint.data()['e']['name'] not in finished_endpoints_all and endpoint.data()['e']['name'] not in result['NO_OBJECT']:
-                result["NO_OBJECT"].append(endpoint.data()['e']['name'])
+        # Save all Endpoints which are never used one time in this list, the endpoint names are unique
+        result["NO_OBJECT"] = [endpoint_name for endpoint_name in self.graph.endpoints if endpoint_name not in finished_endpoints_all]
 
         return result
     
     def __set_object_crud(self):
         ''' Private function to set the object_crud dictionary '''
-        # Get informations from all Object Nodes from database
-        objects, summary, keys = self.driver.execute_query(
-            "MATCH (o:Object) RETURN o",
-        )
-
-        # Get informations from all Endpoint Nodes from database
-        all_endpoints, summary, keys = self.driver.execute_query(
-            "MATCH (e:Endpoint) RETURN e",
-        )
-
         # Init result variable 
         result = {}
         # Init variable which stores all endpoints that have been used from at leatst one object
-        finished_endpoints_all = []
-        for object in objects:
-            # Get all related Endpoints Nodes
-            endpoints, summary, keys = self.driver.execute_query(
-                "MATCH (e:Endpoint)-[r]-(o:Object {name: $name}) RETURN DISTINCT e, r",
-                name=object.data()['o']['name']
-            )
-            # Init object name as key in result
-            result[object.data()['o']['name']] = {
-                "create": [],
-                "read": [],
-                "update": [],
-                "delete": []
-            }
-            # Init variable to save finsihed endpoints, so that each endpoint can only assigned once for each object 
-            finished_endpoints = []
-            for endpoint in endpoints:
-                if endpoint.data()['e']['name'] not in finished_endpoints:
-                    # Check if the endpoint is da create, read, update or delete endpoint from this object, if yes append it in list
-                    if endpoint.data()['e']['operation'] == "post" and (endpoint.data()['r'][1] == "IN_REQUEST_BODY" or endpoint.data()['r'][1] == "IS_PARAMETER"):
-                        result[object.data()['o']['name']]["create"].append(endpoint.data()['e']['name'])
-                        finished_endpoints.append(endpoint.data()['e']['name'])
-                    elif endpoint.data()['e']['operation'] == "get" and endpoint.data()['r'][1] == "IN_RESPONSE_BODY":
-                        result[object.data()['o']['name']]["read"].append(endpoint.data()['e']['name'])
-                        finished_endpoints.append(endpoint.data()['e']['name'])
-                    elif endpoint.data()['e']['operation'] == "put" or endpoint.data()['e']['operation'] == "patch":
-                        result[object.data()['o']['name']]["update"].append(endpoint.data()['e']['name'])
-                        finished_endpoints.append(endpoint.data()['e']['name'])
-                    elif endpoint.data()['e']['operation'] == "delete":
-                        result[object.data()['o']['name']]["delete"].append(endpoint.data()['e']['name'])
-                        finished_endpoints.append(endpoint.data()['e']['name'])
-            finished_endpoints_all.extend(finished_endpoints)
+        finished_endpoints_all = set()
+        for object_name in self.graph.objects:
+            result[object_name] = self.__object_crud_entry(object_name)
+            for endpoints in result[object_name].values():
+                finished_endpoints_all.update(endpoints)
 
         # Save all Endpoints which are never used one time in this list
-        result["NO_OBJECT"] = []
-        for endpoint in all_endpoints:
-            if endpoint.data()['e']['name'] not in finished_endpoints_all:
-                result["NO_OBJECT"].append(endpoint.data()['e']['name'])
+        result["NO_OBJECT"] = [endpoint_name for endpoint_name in self.graph.endpoints if endpoint_name not in finished_endpoints_all]
 
         return result
+
+    def __object_crud_entry(self, object_name):
+        ''' Private function to get the create, read, update and delete endpoints of one Object, every Object is only resolved once '''
+        if object_name in self.object_crud_entries:
+            return self.object_crud_entries[object_name]
+        # Init the entry of the object
+        result = {
+            "create": [],
+            "read": [],
+            "update": [],
+            "delete": []
+        }
+        # Init variable to save finsihed endpoints, so that each endpoint can only assigned once for each object 
+        finished_endpoints = set()
+        for relationship in self.graph.object_relationships[object_name]:
+            endpoint_name = relationship['endpoint']
+            operation = self.graph.endpoints[endpoint_name]['operation']
+            if endpoint_name not in finished_endpoints:
+                # Check if the endpoint is da create, read, update or delete endpoint from this object, if yes append it in list
+                if operation == "post" and (relationship['type'] == "IN_REQUEST_BODY" or relationship['type'] == "IS_PARAMETER"):
+                    result["create"].append(endpoint_name)
+                    finished_endpoints.add(endpoint_name)
+                elif operation == "get" and relationship['type'] == "IN_RESPONSE_BODY":
+                    result["read"].append(endpoint_name)
+                    finished_endpoints.add(endpoint_name)
+                elif operation == "put" or operation == "patch":
+                    result["update"].append(endpoint_name)
+                    finished_endpoints.add(endpoint_name)
+                elif operation == "delete":
+                    result["delete"].append(endpoint_name)
+                    finished_endpoints.add(endpoint_name)
+        self.object_crud_entries[object_name] = result
+        return result
     
     def __set_endpoint_list(self):
         ''' Private function to set the endpoint_list dictionary '''
-        # Get informations from all Object Nodes from database
-        all_endpoints, summary, keys = self.driver.execute_query(
-            "MATCH (e:Endpoint) RETURN e",
-        )
+        return dict(self.iter_endpoint_list())
 
-        # Init result variable 
-        result = {}
+    def iter_endpoint_list(self):
+        ''' Function to get a generator for the endpoint_list, which yields one (endpoint name, entry) tuple after another in endpoint order.
+            The graph is loaded at once, so a missing graph raises LookupError here and not while iterating '''
+        self.__load_graph()
+        return self.__iter_endpoint_list()
+
+    def __iter_endpoint_list(self):
+        ''' Private generator for the endpoint_list entries '''
         # Iterate through all endpoints and create preparation and dismantling sequences, get list of alle connected objects and sequence_length for testing this endpoint
-        for endpoint in all_endpoints:
-            # Init cariables
-            connected_with_objects = []
-            preparation = []
-            dismantling = []
-            sequence_length = 0
-
-            # Check if the endpoint is create or delete endpoint from a object
+        items = ((endpoint_name, self.__endpoint_task(endpoint_name)) for endpoint_name in self.graph.endpoints)
+        items = ((endpoint_name, task, self.__previous_entry(endpoint_name, task)) for endpoint_name, task in items)
+
+        created = None
+        if self.executor is not None:
+            # The endpoints are independent, so they are spread over the worker processes. map keeps the endpoint order
+            items = list(items)
+            tasks = [task for endpoint_name, task, entry in items if entry is None]
+            created = self.executor.map(endpoint_entry, tasks, chunksize=max(1, len(tasks) // 32))
+
+        for endpoint_name, task, entry in items:
+            if entry is None:
+                entry = next(created) if created is not None else endpoint_entry(task)
+                self.recomputed.append(endpoint_name)
+            yield endpoint_name, entry
+
+    def __previous_entry(self, endpoint_name, task):
+        ''' Private function to get the entry of an endpoint from the previous results if its task did not change, else None.
+            The task contains the connected objects, their dependencies and create/delete endpoints, so it covers the whole closure '''
+        fingerprint = hashlib.sha256(json.dumps(task, sort_keys=True).encode("utf-8")).hexdigest()
+        self.fingerprints[endpoint_name] = fingerprint
+        if self.previous is None or self.previous.get('fingerprints', {}).get(endpoint_name) != fingerprint:
+            return None
+        return self.previous['endpoint_list'].get(endpoint_name)
+
+    def __endpoint_task(self, endpoint_name):
+        ''' Private function to collect everything the sequences of one endpoint need, so they can be created in another process '''
+        connected_with_objects, dependencies, crud_endpoint = self.__endpoint_dependencies(endpoint_name)
+        return {
+            "connected_with_objects": connected_with_objects,
+            "dependencies": dependencies,
+            "crud_endpoint": crud_endpoint,
+            # Only the create and delete endpoints of the connected objects are used
+            "object_crud": {
+                object_name: {
+                    "create": self.__object_crud_entry(object_name)["create"],
+                    "delete": self.__object_crud_entry(object_name)["delete"]
+                }
+                for object_name in connected_with_objects
+            },
+            "max_orderings": self.max_orderings,
+            "count_only": self.count_only,
+            "factorised": self.factorised
+        }
+
+    def get_endpoint_statistics(self):
+        ''' Function to get sequence_length, number of sequences and min/max length of all endpoints without generating the sequences '''
+        return dict(self.iter_endpoint_statistics())
+
+    def iter_endpoint_statistics(self):
+        ''' Function to get a generator for the endpoint statistics, which yields one (endpoint name, statistics) tuple after another.
+            The graph is loaded at once, so a missing graph raises LookupError here and not while iterating '''
+        self.__load_graph()
+        return self.__iter_endpoint_statistics()
+
+    def __iter_endpoint_statistics(self):
+        ''' Private generator for the endpoint statistics '''
+        for endpoint_name in self.graph.endpoints:
+            yield endpoint_name, self.__endpoint_statistics(endpoint_name)
+
+    def __endpoint_statistics(self, endpoint_name):
+        ''' Private function to calculate the statistics of one endpoint from the number of object orders and endpoint alternatives.
+            The values are the same as for the endpoint_list entry with all object orders '''
+        connected_with_objects, dependencies, crud_endpoint = self.__endpoint_dependencies(endpoint_name)
+        count_orderings = ordering_counter(connected_with_objects, dependencies)
+
+        # Groups of (number of object orders, sequences per order, length of these sequences)
+        object_crud = {object_name: self.__object_crud_entry(object_name) for object_name in connected_with_objects}
+        preparation = sequence_groups(connected_with_objects, count_orderings, crud_endpoint, object_crud, "create")
+        dismantling = sequence_groups(connected_with_objects, count_orderings, crud_endpoint, object_crud, "delete")
+
+        result = {
+            "connected_with_objects": connected_with_objects,
+            "ordering_count": count_orderings(),
+            "preparation_count": 0,
+            "dismantling_count": 0,
+            "sequence_length": 0,
+            "min_length": 0,
+            "max_length": 0
+        }
+        for kind, groups in (("preparation", preparation), ("dismantling", dismantling)):
+            count = sum(orderings * sequences for orderings, sequences, length in groups)
+            total_length = sum(orderings * sequences * length for orderings, sequences, length in groups)
+            lengths = [length for orderings, sequences, length in groups if orderings * sequences > 0]
+            result[f'{kind}_count'] = count
+            if count > 0:
+                result["sequence_length"] = result["sequence_length"] + math.ceil(total_length / count)
+                result["min_length"] = result["min_length"] + min(lengths)
+                result["max_length"] = result["max_length"] + max(lengths)
+
+        return result
+
+    def __endpoint_dependencies(self, endpoint_name):
+        ''' Private function to get the connected objects, the dependencies between them and the create/delete object of one endpoint '''
+        # Connected objects and dependencies as dicts, to keep the order of the first occurrence with O(1) membership tests
+        connected_with_objects = {}
+        dependencies = {}
+
+        # Every directly related Object adds the Objects and dependencies of its HAS_PROPERTY paths
+        for relationship in self.graph.endpoint_relationships[endpoint_name]:
+            if relationship['object'] not in connected_with_objects:
+                connected_with_objects[relationship['object']] = None
+                path_objects, path_dependencies = self.__object_dependencies(relationship['object'])
+                connected_with_objects.update(dict.fromkeys(path_objects))
+                dependencies.update(dict.fromkeys(path_dependencies))
+
+        # Check if the endpoint is create or delete endpoint from a object
+        crud_endpoint = self.__crud_endpoint(endpoint_name)
+        return list(connected_with_objects), list(dependencies), crud_endpoint
+
+    def __object_dependencies(self, object_name):
+        ''' Private function to get the Objects on the HAS_PROPERTY paths of an Object and the dependency tupels between them,
+            both in path order. Every Object is only resolved once, all endpoints share the result '''
+        if object_name not in self.object_dependencies:
+            property_paths = self.graph.property_paths(object_name, self.max_depth)
+            # Dependencies point from the Object without properties back to the related Object
+            paths = [property_path[::-1] for property_path in property_paths] if property_paths else [[object_name]]
+            self.object_dependencies[object_name] = (
+                list(dict.fromkeys(path_object for property_path in property_paths for path_object in property_path)),
+                list(dict.fromkeys((path[count], path[count + 1]) for path in paths for count in range(len(path) - 1)))
+            )
+        return self.object_dependencies[object_name]
+
+    def __crud_endpoint(self, endpoint_name):
+        ''' Private function to get the create/delete role of an endpoint as (object name, "create"/"delete") or None.
+            Only the Objects related to the endpoint are resolved, the first one in node order wins, create before delete '''
+        if endpoint_name not in self.crud_endpoints:
             crud_endpoint = None
-            for object_name, crud_details in self.object_crud.items():
-                if object_name != "NO_OBJECT" and endpoint.data()['e']['name'] in crud_details['create']:
+            related_objects = {relationship['object'] for relationship in self.graph.endpoint_relationships[endpoint_name]}
+            for object_name in sorted(related_objects, key=self.graph.object_position.get):
+                crud_details = self.__object_crud_entry(object_name)
+                if endpoint_name in crud_details['create']:
                     crud_endpoint = (object_name, "create")
-                    break
-                if object_name != "NO_OBJECT" and endpoint.data()['e']['name'] in crud_details['delete']:
+                elif endpoint_name in crud_details['delete']:
                     crud_endpoint = (object_name, "delete")
+                if crud_endpoint is not None:
                     break
-                
-            
-            # Get all related Object Nodes with informations about the relationship
-            relationship_objects, summary, keys = self.driver.execute_query(
-                "MATCH (e:Endpoint {name: $name})-[r]-(o:Object) RETURN o, r", 
-                name=endpoint.data()['e']['name']
-            )
-            
-            # Get all paths from graph with HAS_PROPERTY relationship beetween Objects
-            paths = []
-            for relationship_object in relationship_objects:
-                if relationship_object.data()['o']['name'] not in connected_with_objects:
-                    connected_with_objects.append(relationship_object.data()['o']['name'])
-                    property_objects, summary, keys = self.driver.execute_query(
-                            """MATCH (start :Object {name: $name})
-                            CALL {
-                                WITH start
-                                MATCH path = (start)-[:HAS_PROPERTY*]->(end)
-                                WHERE NOT (end)-[:HAS_PROPERTY]->()
-                                RETURN path
-                            }
-                                RETURN [n IN nodes(path) | n.name] AS nodeSequence
-                                ORDER BY size(nodes(path)) DESC
-                            """,
-                            name=relationship_object.data()['o']['name']
-                        )
-                    
-                    if property_objects:
-                        for property_object in property_objects:
-                            paths.append(property_object['nodeSequence'][::-1])
-                            for object_name in property_object['nodeSequence']:
-                                if object_name not in connected_with_objects:
-                                    connected_with_objects.append(object_name)
-                    else:
-                        paths.append([relationship_object.data()['o']['name']])
-
-            # Get alle dependency tupels from paths
-            dependencies = []
-            for path in paths:
-                for count, object in enumerate(path):
-                    if count != len(path)-1 and (path[count], path[count+1]) not in dependencies:
-                        dependency = (path[count], path[count+1])
-                        dependencies.append(dependency)
-
-            # Create all permutations from objects and check if there fit all deoendency
-            perm = permutations(connected_with_objects)
-            paths = []
-            for i in list(perm):
-                check = True
-                for dependency in dependencies:
-                    if i.index(dependency[0]) > i.index(dependency[1]):
-                        check = False
-                if check:
-                    paths.append(i)
-
-            # Iterate through all valid object paths and create sequences
-            for path in paths:
-                endpoint_list_preparation = []
-                endpoint_list_dismantling = []
-                for object in path:
-                    count = len(endpoint_list_preparation)
-                    # preparation
-                    if crud_endpoint == None or crud_endpoint[1] == "delete" or crud_endpoint[0] != object:
-                        if self.object_crud[object]["create"]:
-                            if count == 0:
-                                for create_method in self.object_crud[object]["create"]:
-                                    endpoint_list_preparation.append([create_method])
-                            else:
-                                new_pre_lists = []
-                                for pre_list in endpoint_list_preparation:
-                                    copy_pre_list = pre_list.copy()
-                                    
-                                    for index, create_method in enumerate(self.object_crud[object]["create"]):
-                                        if index == 0:
-                                            pre_list.append(create_method)
-                                        else:
-                                            copy_copy_pre_list = copy_pre_list.copy()
-                                            copy_copy_pre_list.append(create_method)
-                                            new_pre_lists.append(copy_copy_pre_list)
-                                endpoint_list_preparation = endpoint_list_preparation + new_pre_lists
-                        else:
-                            if count == 0:
-                                endpoint_list_preparation.append([f'Placeholder<{object}>'])
-                            else:
-                                for pre_list in endpoint_list_preparation:
-                                    pre_list.append(f'Placeholder<{object}>')
-                    # dismantling
-                    if crud_endpoint == None or crud_endpoint[1] == "create" or crud_endpoint[0] != object:
-                        if self.object_crud[object]["delete"]:
-                            if count == 0:
-                                for delete_method in self.object_crud[object]["delete"]:
-                                    endpoint_list_dismantling.append([delete_method])
-                            else:
-                                new_dis_lists = []
-                                for dis_list in endpoint_list_dismantling:
-                                    copy_dis_list = dis_list.copy()
-                                    
-                                    for index, delete_method in enumerate(self.object_crud[object]["delete"]):
-                                        if index == 0:
-                                            dis_list.append(delete_method)
-                                        else:
-                                            copy_copy_dis_list = copy_dis_list.copy()
-                                            copy_copy_dis_list.append(delete_method)
-                                            new_dis_lists.append(copy_copy_dis_list)
-                                endpoint_list_dismantling = endpoint_list_dismantling + new_dis_lists
-                        else:
-                            if count == 0:
-                                endpoint_list_dismantling.append([f'Placeholder<{object}>'])
-                            else:
-                                for dis_list in endpoint_list_dismantling:
-                                    dis_list.append(f'Placeholder<{object}>')
-
-                preparation = preparation + endpoint_list_preparation
-                dismantling = dismantling + endpoint_list_dismantling
-
-            # Calculate sequence_length
-            if preparation:
-                sequence_length = sequence_length + self.average_sequnece_lenght(preparation)
-            if dismantling:
-                sequence_length = sequence_length + self.average_sequnece_lenght(dismantling)
-            result[endpoint.data()['e']['name']] = {
-                "connected_with_objects": connected_with_objects,
-                "preparation": preparation,
-                "dismantling": dismantling,
-                "sequence_length": sequence_length
-            }
-            print(f"{endpoint.data()['e']['name']} - {sequence_length}")
+            self.crud_endpoints[endpoint_name] = crud_endpoint
+        return self.crud_endpoints[endpoint_name]
 
-        return result
-    
     def average_sequnece_lenght(self, list):
         ''' Function, to get the average lenght of lists in a list '''
         count_lists = len(list)
         count_sequnces = sum(len(sub_list) for sub_list in list)
         average_lenght = count_sequnces / count_lists if count_lists > 0 else 0
         return math.ceil(average_lenght)
-
-    def close_driver(self):
-        self.driver.close()
\ No newline at end of file
@@ -0,0 +1,101 @@
+from collections import OrderedDict
+import hashlib
+import json
+import threading
+
+import yaml
+# Same YAML rules as openapi_spec_validator (timestamps stay strings), on top of libyaml's CSafeLoader if available
+from jsonschema_path.loaders import JsonschemaSafeLoader
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+def raw_hash(data):
+    ''' Function to get the hash of the raw bytes of an uploaded file '''
+    return hashlib.sha256(data).hexdigest()
+
+def parse_spec(data, filename):
+    ''' Function to parse the raw bytes of an OpenAPI File. json files are read with orjson if it is installed,
+        all other files as yaml. Returns the same dict as openapi_spec_validator's reader, with only string keys '''
+    if filename.endswith(".json"):
+        if orjson is not None:
+            return orjson.loads(data)
+        return json.loads(data)
+    spec_dict = yaml.load(data, Loader=JsonschemaSafeLoader)
+    # Keys like status codes are turned into strings, like the validator sees them
+    _string_keys(spec_dict)
+    return spec_dict
+
+def _string_keys(spec_dict):
+    ''' Function to turn the non-string keys of all nested dicts into strings in place, the same way json.dumps writes them.
+        Only dicts with such keys are rebuilt, dicts and lists shared by yaml aliases are visited once '''
+    seen = {id(spec_dict)}
+    # Other files than OpenAPI Files may be a single value, they are rejected by the validation
+    stack = [spec_dict] if isinstance(spec_dict, (dict, list)) else []
+    while stack:
+        value = stack.pop()
+        if isinstance(value, dict):
+            for key in value:
+                if not isinstance(key, str):
+                    items = [(key if isinstance(key, str) else json.dumps(key), item) for key, item in value.items()]
+                    value.clear()
+                    value.update(items)
+                    break
+            value = value.values()
+        for item in value:
+            if isinstance(item, (dict, list)) and id(item) not in seen:
+                seen.add(id(item))
+                stack.append(item)
+
+def load_spec(path):
+    ''' Function to read and parse an OpenAPI File from disk '''
+    with open(path, "rb") as file:
+        return parse_spec(file.read(), path)
+
+class SpecCache():
+    def __init__(self, max_items=16, max_validations=1024):
+        ''' Init Function '''
+        # LRU of parsed specs with their content hash by the hash of their raw bytes, the dicts are shared and never changed
+        self.max_items = max_items
+        self.specs = OrderedDict()
+        # LRU of validation results by content hash and validation level
+        self.max_validations = max_validations
+        self.validations = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        ''' Function to get the parsed spec and its content hash for a raw hash. Returns None if it is not cached '''
+        with self.lock:
+            if key not in self.specs:
+                return None
+            self.specs.move_to_end(key)
+            return self.specs[key]
+
+    def set(self, key, spec_dict, content_hash):
+        ''' Function to remember a parsed spec, the least recently used ones are dropped above max_items '''
+        with self.lock:
+            self.specs[key] = (spec_dict, content_hash)
+            self.specs.move_to_end(key)
+            while len(self.specs) > self.max_items:
+                self.specs.popitem(last=False)
+
+    def get_validation(self, content_hash, level):
+        ''' Function to get the cached validation result of a spec on a level. Returns None if it was not validated,
+            else dict with valid and the error message '''
+        with self.lock:
+            key = (content_hash, level)
+            if key not in self.validations:
+                return None
+            self.validations.move_to_end(key)
+            return self.validations[key]
+
+    def set_validation(self, content_hash, level, error=None):
+        ''' Function to remember the validation result of a spec on a level, error is None for valid specs '''
+        with self.lock:
+            key = (content_hash, level)
+            self.validations[key] = {'valid': error is None, 'error': error}
+            self.validations.move_to_end(key)
+            while len(self.validations) > self.max_validations:
+                self.validations.popitem(last=False)
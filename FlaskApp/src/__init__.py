@@ -1,9 +1,97 @@
+from concurrent.futures import ProcessPoolExecutor
+import atexit
+import multiprocessing
+import os
+
 from flask import Flask
 
+from . import database
+from .GraphBackend import create_backend
+from .ResultCache import ResultCache
+from .SpecCache import SpecCache
+from .JobManager import JobManager
+from .validation import LEVELS
+
 def create_app(test_config=None):
     # create and configure the app
     app = Flask(__name__)
     app.secret_key = 'random string'
+    app.config.from_mapping(
+        # Storage of the graphs, "neo4j" or the in-process "memory" backend
+        GRAPH_BACKEND=os.environ.get('GRAPH_BACKEND', 'neo4j'),
+        # Connection to neo4j, one pooled driver is shared by all requests and jobs
+        NEO4J_URI=os.environ.get('NEO4J_URI', 'bolt://neo4j:7687/'),
+        NEO4J_DATABASE=os.environ.get('NEO4J_DATABASE', database.DATABASE),
+        NEO4J_MAX_POOL_SIZE=int(os.environ.get('NEO4J_MAX_POOL_SIZE', 50)),
+        NEO4J_ACQUISITION_TIMEOUT=float(os.environ.get('NEO4J_ACQUISITION_TIMEOUT', 60)),
+        NEO4J_BATCH_SIZE=int(os.environ.get('NEO4J_BATCH_SIZE', 1000)),
+        # Number of template results kept in memory, directory and size limit for the results kept on disk
+        RESULT_CACHE_ITEMS=32,
+        RESULT_CACHE_DIRECTORY=os.path.join(app.root_path, 'uploads', 'cache'),
+        RESULT_CACHE_DISK_BYTES=512 * 1024 * 1024,
+        # Number of parsed and validated specs kept in memory, keyed by the hash of the uploaded bytes
+        SPEC_CACHE_ITEMS=16,
+        # Validation of uploads without their own level: "full", "structural" (only what the graph reads) or "off"
+        VALIDATION_LEVEL=os.environ.get('VALIDATION_LEVEL', 'full'),
+        # Maximum number of Objects and cycles on a HAS_PROPERTY path of a connected Object, unset = all
+        PROPERTY_DEPTH=int(os.environ['PROPERTY_DEPTH']) if os.environ.get('PROPERTY_DEPTH') else None,
+        # Add a Server-Timing header with the stages and Cypher queries of every request
+        METRICS_DEBUG_HEADER=os.environ.get('METRICS_DEBUG_HEADER', '') == '1',
+        # Number of graphs of uploads kept in the backend, the least recently uploaded ones are deleted. Fixed namespaces are always kept
+        GRAPH_NAMESPACES=int(os.environ.get('GRAPH_NAMESPACES', 16)),
+        # Number of uploads processed at the same time, each spec has its own namespace in the database
+        JOB_WORKERS=4,
+        # Number of processes which create the sequences of the endpoints of one spec, 1 = in the job/request thread
+        SEQUENCE_WORKERS=int(os.environ.get('SEQUENCE_WORKERS', 1)),
+    )
+    if test_config is not None:
+        app.config.from_mapping(test_config)
+
+    # A depth of 0 or less would silently mean unlimited paths
+    if app.config['PROPERTY_DEPTH'] is not None and app.config['PROPERTY_DEPTH'] < 1:
+        raise ValueError(f'PROPERTY_DEPTH has to be at least 1, got {app.config["PROPERTY_DEPTH"]}')
+    # An unknown level would silently mean full validation
+    if app.config['VALIDATION_LEVEL'] not in LEVELS:
+        raise ValueError(f'VALIDATION_LEVEL has to be one of {", ".join(LEVELS)}, got {app.config["VALIDATION_LEVEL"]}')
+
+    # One backend is shared by all requests and jobs, it is closed when the process shuts down
+    app.extensions['graph_backend'] = create_backend(app.config)
+    atexit.register(app.extensions['graph_backend'].close)
+
+    # Cache for the generated templates, keyed by the content hash of the uploaded OpenAPI File
+    app.extensions['result_cache'] = ResultCache(
+        app.config['RESULT_CACHE_DIRECTORY'],
+        max_items=app.config['RESULT_CACHE_ITEMS'],
+        max_disk_bytes=app.config['RESULT_CACHE_DISK_BYTES']
+    )
+
+    # Cache for the parsed and validated uploads, so re-uploads of the same file skip both steps
+    app.extensions['spec_cache'] = SpecCache(max_items=app.config['SPEC_CACHE_ITEMS'])
+
+    # Process pool for the sequences of the endpoints, shared by all jobs and requests. Spawned processes
+    # do not inherit the threads and connections of the app
+    app.extensions['sequence_pool'] = None
+    if app.config['SEQUENCE_WORKERS'] > 1:
+        app.extensions['sequence_pool'] = ProcessPoolExecutor(
+            max_workers=app.config['SEQUENCE_WORKERS'],
+            mp_context=multiprocessing.get_context("spawn")
+        )
+
+    # Local worker pool which processes the uploads in the background
+    app.extensions['job_manager'] = JobManager(
+        app.extensions['result_cache'],
+        app.extensions['graph_backend'],
+        max_workers=app.config['JOB_WORKERS'],
+        sequence_pool=app.extensions['sequence_pool'],
+        spec_cache=app.extensions['spec_cache'],
+        validation=app.config['VALIDATION_LEVEL'],
+        property_depth=app.config['PROPERTY_DEPTH'],
+        max_graphs=app.config['GRAPH_NAMESPACES']
+    )
+    # Finish the running jobs before the backend and the process pool are closed on shutdown
+    if app.extensions['sequence_pool'] is not None:
+        atexit.register(app.extensions['sequence_pool'].shutdown)
+    atexit.register(app.extensions['job_manager'].shutdown)
 
     from . import openapi
     app.register_blueprint(openapi.bp)
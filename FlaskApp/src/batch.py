@@ -0,0 +1,168 @@
+from concurrent.futures import ProcessPoolExecutor, as_completed
+import glob
+import json
+import multiprocessing
+import os
+import time
+import uuid
+
+from .GraphBackend import create_backend, backend_config
+from .GraphGenerator import GraphGenerator
+from .SequenceGenerator import SequenceGenerator
+from .ResultCache import spec_hash
+from .export import json_chunks
+from .SpecCache import raw_hash, parse_spec
+from .validation import validate_spec
+
+EXTENSIONS = (".json", ".yaml", ".yml")
+TEMPLATES = ("object_list", "object_crud", "endpoint_list")
+MANIFEST = "manifest.json"
+
+# Backend of a worker process, every spec gets its own namespace in it
+_backend = None
+
+def find_specs(inputs):
+    ''' Function to get all spec files of the given directories, globs and files, sorted and without duplicates '''
+    paths = []
+    for pattern in inputs:
+        if os.path.isdir(pattern):
+            matches = [os.path.join(root, name) for root, dirs, names in os.walk(pattern) for name in names]
+        else:
+            matches = glob.glob(pattern, recursive=True)
+        paths.extend(os.path.abspath(path) for path in matches if path.endswith(EXTENSIONS) and os.path.isfile(path))
+    return sorted(set(paths))
+
+def output_name(path, root):
+    ''' Function to get the output directory of a spec, its path below the common root without extension '''
+    return os.path.splitext(os.path.relpath(path, root))[0]
+
+def load_manifest(output_dir):
+    ''' Function to load the manifest of an earlier run. Returns {} if there is none '''
+    try:
+        with open(os.path.join(output_dir, MANIFEST), "r") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+def save_manifest(output_dir, manifest):
+    ''' Function to save the manifest, first to a temporary file so an interrupted run never leaves a broken manifest '''
+    manifest_path = os.path.join(output_dir, MANIFEST)
+    with open(f'{manifest_path}.tmp', "w") as file:
+        json.dump(manifest, file, indent=4)
+    os.replace(f'{manifest_path}.tmp', manifest_path)
+
+def is_processed(entry, data, options, output_dir):
+    ''' Function to check if a spec with this content was already processed with the same options and its templates still exist '''
+    if entry is None or entry.get("status") != "done" or entry.get("raw_hash") != raw_hash(data) or entry.get("options") != options:
+        return False
+    return all(os.path.isfile(os.path.join(output_dir, entry["output"], f'{template}.json')) for template in TEMPLATES)
+
+def _init_worker(backend):
+    ''' Function to create the backend once per worker process '''
+    global _backend
+    _backend = create_backend(backend_config(backend))
+
+def process_spec(path, name, output_dir, options):
+    ''' Function to parse, validate, ingest and generate the templates of one spec in its own namespace.
+        Returns the manifest entry with the hashes, the status and the seconds of every stage '''
+    entry = {"output": name, "options": options, "status": "failed", "error": None, "seconds": {}}
+    # Files with the same content are processed at the same time, so the namespace is unique per task and not the spec hash
+    namespace = f'batch-{uuid.uuid4().hex}'
+    try:
+        start = time.perf_counter()
+        with open(path, "rb") as file:
+            data = file.read()
+        entry["raw_hash"] = raw_hash(data)
+        spec_dict = parse_spec(data, path)
+        entry["spec_hash"] = spec_hash(spec_dict)
+        entry["seconds"]["parse"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        validate_spec(spec_dict, options["validation"])
+        entry["seconds"]["validate"] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        GraphGenerator(spec_dict, namespace, _backend).create_graph()
+        entry["seconds"]["ingest"] = time.perf_counter() - start
+
+        sg = SequenceGenerator(namespace, _backend, max_orderings=options["max_orderings"], max_depth=options["max_depth"])
+        results, endpoint_list = sg.iter_results()
+
+        # Same files as the downloads of the app, the endpoint_list is written while it is created
+        start = time.perf_counter()
+        directory = os.path.join(output_dir, name)
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, "endpoint_list.json"), "w") as output_file:
+            for chunk in json_chunks(endpoint_list):
+                output_file.write(chunk)
+        for template in ("object_list", "object_crud"):
+            with open(os.path.join(directory, f'{template}.json'), "w") as output_file:
+                json.dump(results[template], output_file, indent=4)
+        entry["seconds"].update(sg.durations)
+        entry["seconds"]["export"] = time.perf_counter() - start - sg.durations["endpoint_list"]
+        entry["endpoints"] = len(sg.graph.endpoints)
+        entry["status"] = "done"
+    except Exception as error:
+        entry["error"] = f'{type(error).__name__}: {error}'
+    finally:
+        # The graph is only needed for the templates
+        _backend.delete_graph(namespace)
+    return entry
+
+def run_batch(inputs, output_dir, workers=None, backend="memory", validation="full", max_orderings=None, max_depth=None, force=False, progress=None):
+    ''' Function to process all specs of the inputs in a process pool. Specs whose content and options did not change since the last run
+        are skipped unless force is set. Returns the summary, which is saved together with all entries in the manifest '''
+    start = time.perf_counter()
+    paths = find_specs(inputs)
+    root = os.path.commonpath([os.path.dirname(path) for path in paths]) if paths else ""
+    os.makedirs(output_dir, exist_ok=True)
+    manifest = load_manifest(output_dir)
+    manifest.setdefault("specs", {})
+    entries = manifest["specs"]
+    options = {"validation": validation, "max_orderings": max_orderings, "max_depth": max_depth}
+
+    # Unchanged specs are found by the hash of their bytes and the options, without parsing them
+    tasks = []
+    skipped = 0
+    for path in paths:
+        name = output_name(path, root)
+        with open(path, "rb") as file:
+            data = file.read()
+        if not force and is_processed(entries.get(name), data, options, output_dir):
+            skipped = skipped + 1
+        else:
+            tasks.append((path, name))
+
+    # Every worker has its own backend, so the graphs of the specs never share a process or a namespace
+    if tasks:
+        with ProcessPoolExecutor(
+            max_workers=min(workers or os.cpu_count() or 1, len(tasks)),
+            mp_context=multiprocessing.get_context("spawn"),
+            initializer=_init_worker,
+            initargs=(backend,)
+        ) as executor:
+            futures = {executor.submit(process_spec, path, name, output_dir, options): name for path, name in tasks}
+            for future in as_completed(futures):
+                name = futures[future]
+                entries[name] = future.result()
+                # Save every finished spec at once, so an interrupted run can be resumed
+                save_manifest(output_dir, manifest)
+                if progress is not None:
+                    progress(name, entries[name])
+
+    # Seconds per stage summed over all processed specs
+    stages = {}
+    for path, name in tasks:
+        for stage, seconds in entries[name]["seconds"].items():
+            stages[stage] = stages.get(stage, 0.0) + seconds
+    summary = {
+        "specs": len(paths),
+        "processed": sum(1 for path, name in tasks if entries[name]["status"] == "done"),
+        "failed": sum(1 for path, name in tasks if entries[name]["status"] != "done"),
+        "skipped": skipped,
+        "seconds": time.perf_counter() - start,
+        "stage_seconds": stages
+    }
+    manifest["summary"] = summary
+    save_manifest(output_dir, manifest)
+    return summary
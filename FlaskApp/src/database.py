@@ -0,0 +1,103 @@
+import time
+
+from . import metrics
+
+DATABASE = "neo4j"
+
+# Constraints and indexes used by the lookups of GraphGenerator and SequenceGenerator.
+# Names are only unique inside one spec namespace, so the old single property constraints are dropped
+SCHEMA = [
+    "DROP CONSTRAINT object_name IF EXISTS",
+    "DROP CONSTRAINT endpoint_name IF EXISTS",
+    "CREATE CONSTRAINT object_spec_name IF NOT EXISTS FOR (o:Object) REQUIRE (o.spec, o.name) IS UNIQUE",
+    "CREATE CONSTRAINT endpoint_spec_name IF NOT EXISTS FOR (e:Endpoint) REQUIRE (e.spec, e.name) IS UNIQUE",
+    "CREATE INDEX endpoint_operation IF NOT EXISTS FOR (e:Endpoint) ON (e.operation)",
+    "CREATE INDEX object_spec IF NOT EXISTS FOR (o:Object) ON (o.spec)",
+    "CREATE INDEX endpoint_spec IF NOT EXISTS FOR (e:Endpoint) ON (e.spec)",
+    "CREATE INDEX openapi_file_spec IF NOT EXISTS FOR (f:OpenAPIFile) ON (f.spec)",
+]
+
+# Labels of all nodes which belong to a spec namespace
+LABELS = ["Endpoint", "Object", "OpenAPIFile"]
+
+# Lookups which have to be answered by an index seek instead of a label scan
+LOOKUPS = {
+    "object_name": "MATCH (o:Object {spec: $spec, name: $name}) RETURN o",
+    "endpoint_name": "MATCH (e:Endpoint {spec: $spec, name: $name}) RETURN e",
+    "endpoint_operation": "MATCH (e:Endpoint {operation: $operation}) RETURN e",
+    "object_spec": "MATCH (o:Object {spec: $spec}) RETURN o",
+    "endpoint_spec": "MATCH (e:Endpoint {spec: $spec}) RETURN e",
+}
+
+# Drivers and databases which were already checked and got their schema in this process
+_schema_ready = set()
+
+def prepare(driver, database=DATABASE):
+    ''' Function to check the connection once and make sure the schema exists before a driver is used '''
+    if (id(driver), database) not in _schema_ready:
+        driver.verify_connectivity()
+        create_schema(driver, database)
+        _schema_ready.add((id(driver), database))
+
+def execute_query(driver, metric, query, **kwargs):
+    ''' Function to run a query with the driver and record it under the metric name. Returns records, summary and keys '''
+    start = time.perf_counter()
+    records, summary, keys = driver.execute_query(query, **kwargs)
+    metrics.record_query(metric, time.perf_counter() - start, summary)
+    return records, summary, keys
+
+def run_query(tx, metric, query, **parameters):
+    ''' Function to run a query inside a transaction, consume its result and record it under the metric name. Returns the summary '''
+    start = time.perf_counter()
+    summary = tx.run(query, **parameters).consume()
+    metrics.record_query(metric, time.perf_counter() - start, summary)
+    return summary
+
+def create_schema(driver, database=DATABASE):
+    ''' Function to create all constraints and indexes, existing ones are left untouched '''
+    for query in SCHEMA:
+        execute_query(driver, "create_schema", query, database_=database)
+
+def delete_spec(driver, spec_id, database=DATABASE, batch_size=1000):
+    ''' Function to delete all nodes and relationships of one spec namespace in batches. Returns the number of deleted nodes '''
+    deleted = 0
+    for label in LABELS:
+        while True:
+            records, summary, keys = execute_query(
+                driver,
+                "delete_spec",
+                f"""
+                MATCH (n:{label} {{spec: $spec}})
+                WITH n LIMIT $batch_size
+                DETACH DELETE n
+                RETURN count(*) AS deleted
+                """,
+                spec=spec_id,
+                batch_size=batch_size,
+                database_=database
+            )
+            if records[0]["deleted"] == 0:
+                break
+            deleted = deleted + records[0]["deleted"]
+    return deleted
+
+def explain_lookups(driver, database=DATABASE):
+    ''' Function to check with EXPLAIN which lookups are planned with an index seek. Returns dict lookup -> bool '''
+    result = {}
+    for lookup, query in LOOKUPS.items():
+        records, summary, keys = execute_query(
+            driver,
+            "explain",
+            "EXPLAIN " + query,
+            parameters_={"spec": "", "name": "", "operation": ""},
+            database_=database
+        )
+        result[lookup] = any("IndexSeek" in operator for operator in _plan_operators(summary.plan))
+    return result
+
+def _plan_operators(plan):
+    ''' Function to get all operator types from a plan tree '''
+    operators = [plan["operatorType"]]
+    for child in plan.get("children", []):
+        operators.extend(_plan_operators(child))
+    return operators
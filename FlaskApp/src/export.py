@@ -0,0 +1,29 @@
+import json
+import zlib
+
+def json_chunks(items):
+    ''' Generator for the same text json.dump(dict(items), indent=4) writes, one chunk per (key, value) item '''
+    first = True
+    for key, value in items:
+        entry = json.dumps(value, indent=4).replace("\n", "\n    ")
+        yield f'{"{" if first else ","}\n    {json.dumps(key)}: {entry}'
+        first = False
+    yield "{}" if first else "\n}"
+
+def value_chunks(value):
+    ''' Generator for the text json.dump(value, indent=4) writes as one chunk, so it is created while streaming like the others '''
+    yield json.dumps(value, indent=4)
+
+def ndjson_chunks(items, key_name="endpoint"):
+    ''' Generator for newline delimited json, one line per (key, value) item with the key saved under key_name '''
+    for key, value in items:
+        yield json.dumps({key_name: key, **value}) + "\n"
+
+def gzip_chunks(chunks, level=6):
+    ''' Generator to compress text chunks as one gzip stream '''
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode("utf-8"))
+        if compressed:
+            yield compressed
+    yield compressor.flush()
@@ -0,0 +1,80 @@
+# Properties which identify a row of every part of a collected graph
+ROW_KEYS = {
+    'objects': ('name',),
+    'endpoints': ('name', 'path', 'operation'),
+    'has_property': ('from', 'to', 'name', 'list'),
+    'request_body': ('endpoint', 'object'),
+    'parameters': ('endpoint', 'object', 'parameter_name', 'property_name'),
+    'responses': ('endpoint', 'object', 'status_code'),
+}
+
+# Connections with the node parts their ends belong to
+CONNECTIONS = {
+    'has_property': (('from', 'objects'), ('to', 'objects')),
+    'request_body': (('endpoint', 'endpoints'), ('object', 'objects')),
+    'parameters': (('endpoint', 'endpoints'), ('object', 'objects')),
+    'responses': (('endpoint', 'endpoints'), ('object', 'objects')),
+}
+
+def diff_graphs(stored, graph):
+    ''' Function to get the changes which turn the stored graph into the new graph, both as dicts with lists of rows.
+        Returns dict with the new info (None if unchanged), the added and removed rows and the row order of every part and the changed node names '''
+    graph = connected_graph(graph)
+    diff = {
+        'info': graph['info'] if stored['info'] != graph['info'] else None,
+        'added': {},
+        'removed': {},
+        'order': {}
+    }
+    for part in ROW_KEYS:
+        stored_rows = {row_key(part, row): row for row in stored[part]}
+        new_rows = {row_key(part, row): row for row in graph[part]}
+        diff['added'][part] = [row for key, row in new_rows.items() if key not in stored_rows]
+        diff['removed'][part] = [row for key, row in stored_rows.items() if key not in new_rows]
+        # Keys of all rows of the new graph, a backend which keeps the row order rebuilds it from them
+        diff['order'][part] = list(new_rows)
+
+    # Objects with added, removed or changed properties and Endpoints with added, removed or changed connections
+    changed_objects = {}
+    changed_endpoints = {}
+    for rows in (diff['added'], diff['removed']):
+        changed_objects.update(dict.fromkeys(row['name'] for row in rows['objects']))
+        changed_objects.update(dict.fromkeys(row['from'] for row in rows['has_property']))
+        changed_endpoints.update(dict.fromkeys(row['name'] for row in rows['endpoints']))
+        for part in ('request_body', 'parameters', 'responses'):
+            changed_endpoints.update(dict.fromkeys(row['endpoint'] for row in rows[part]))
+    diff['changed'] = {
+        'objects': list(changed_objects),
+        'endpoints': list(changed_endpoints)
+    }
+    return diff
+
+def connected_graph(graph):
+    ''' Function to drop the connections to nodes which are not part of the graph, the backends never store them '''
+    names = {
+        'objects': {row['name'] for row in graph['objects']},
+        'endpoints': {row['name'] for row in graph['endpoints']}
+    }
+    result = dict(graph)
+    for part, ends in CONNECTIONS.items():
+        result[part] = [row for row in graph[part] if all(row[key] in names[nodes] for key, nodes in ends)]
+    return result
+
+def is_empty(diff):
+    ''' Function to check if a diff changes nothing '''
+    return diff['info'] is None and not any(diff['added'].values()) and not any(diff['removed'].values())
+
+def row_key(part, row):
+    ''' Function to get the identifying tuple of a row of a part '''
+    return tuple(row[key] for key in ROW_KEYS[part])
+
+def relationship_row(relationship):
+    ''' Function to turn a loaded relationship back into the part and row GraphGenerator collected it as '''
+    properties = relationship['properties']
+    if relationship['type'] == "HAS_PROPERTY":
+        return 'has_property', {'from': relationship['start'], 'to': relationship['end'], 'name': properties['name'], 'list': properties['list']}
+    if relationship['type'] == "IN_REQUEST_BODY":
+        return 'request_body', {'endpoint': relationship['end'], 'object': relationship['start']}
+    if relationship['type'] == "IS_PARAMETER":
+        return 'parameters', {'endpoint': relationship['end'], 'object': relationship['start'], 'parameter_name': properties['parameter_name'], 'property_name': properties['property_name']}
+    return 'responses', {'endpoint': relationship['start'], 'object': relationship['end'], 'status_code': properties['status_code']}
@@ -0,0 +1,114 @@
+from contextlib import contextmanager
+import contextvars
+import threading
+import time
+
+PREFIX = "openapi_graph"
+
+class Metrics():
+    def __init__(self):
+        ''' Init Function '''
+        # Number of runs and seconds of every stage, like parse, ingest_nodes or endpoint_list
+        self.stages = {}
+        # Number of runs, seconds in the client and seconds reported by the server of every Cypher query
+        self.queries = {}
+        self.lock = threading.Lock()
+
+    def observe_stage(self, stage, seconds):
+        ''' Function to add one run of a stage '''
+        with self.lock:
+            count, total = self.stages.get(stage, (0, 0.0))
+            self.stages[stage] = (count + 1, total + seconds)
+
+    def observe_query(self, query, seconds, server_seconds):
+        ''' Function to add one executed query '''
+        with self.lock:
+            count, total, server_total = self.queries.get(query, (0, 0.0, 0.0))
+            self.queries[query] = (count + 1, total + seconds, server_total + server_seconds)
+
+    def to_prometheus(self):
+        ''' Function to get all values in the Prometheus text format '''
+        with self.lock:
+            stages = dict(self.stages)
+            queries = dict(self.queries)
+
+        lines = [
+            f'# HELP {PREFIX}_stage_seconds Duration of the processing stages',
+            f'# TYPE {PREFIX}_stage_seconds summary'
+        ]
+        for stage, (count, total) in sorted(stages.items()):
+            lines.append(f'{PREFIX}_stage_seconds_count{{stage="{stage}"}} {count}')
+            lines.append(f'{PREFIX}_stage_seconds_sum{{stage="{stage}"}} {total:.6f}')
+
+        # The server time is the time until the first record was available plus the time to consume all records
+        for name, help_text, position, format in (
+            ("queries_total", "Number of executed Cypher queries", 0, "{}"),
+            ("query_seconds_total", "Seconds spent in Cypher queries, measured in the client", 1, "{:.6f}"),
+            ("query_server_seconds_total", "Seconds spent in Cypher queries, reported by the server", 2, "{:.6f}")
+        ):
+            lines.append(f'# HELP {PREFIX}_{name} {help_text}')
+            lines.append(f'# TYPE {PREFIX}_{name} counter')
+            for query, values in sorted(queries.items()):
+                lines.append(f'{PREFIX}_{name}{{query="{query}"}} {format.format(values[position])}')
+        return "\n".join(lines) + "\n"
+
+# Metrics of the whole process
+registry = Metrics()
+
+# Stages and queries of the current request, only collected while a request wants the debug header
+current_request = contextvars.ContextVar("current_request", default=None)
+
+def record_stage(stage, seconds):
+    ''' Function to record one run of a stage in the process metrics and the metrics of the current request '''
+    registry.observe_stage(stage, seconds)
+    collected = current_request.get()
+    if collected is not None:
+        collected.observe_stage(stage, seconds)
+
+def record_query(query, seconds, summary):
+    ''' Function to record one executed query with the timings of its result summary '''
+    server_seconds = 0.0
+    if summary is not None:
+        server_seconds = ((summary.result_available_after or 0) + (summary.result_consumed_after or 0)) / 1000
+    registry.observe_query(query, seconds, server_seconds)
+    collected = current_request.get()
+    if collected is not None:
+        collected.observe_query(query, seconds, server_seconds)
+
+@contextmanager
+def stage(name):
+    ''' Context manager to record the duration of a block as a stage '''
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        record_stage(name, time.perf_counter() - start)
+
+def timed_chunks(name, chunks, durations=None):
+    ''' Generator to record the time spent creating the chunks of a streamed response as a stage.
+        With durations the seconds are also saved in this dict under the name of the stage '''
+    seconds = 0.0
+    try:
+        iterator = iter(chunks)
+        while True:
+            start = time.perf_counter()
+            try:
+                chunk = next(iterator)
+            except StopIteration:
+                break
+            finally:
+                seconds = seconds + time.perf_counter() - start
+            yield chunk
+    finally:
+        record_stage(name, seconds)
+        if durations is not None:
+            durations[name] = seconds
+
+def server_timing(collected):
+    ''' Function to get the Server-Timing header for the stages and queries of a request '''
+    entries = [f'{stage};dur={total * 1000:.1f}' for stage, (count, total) in collected.stages.items()]
+    if collected.queries:
+        count = sum(values[0] for values in collected.queries.values())
+        total = sum(values[1] for values in collected.queries.values())
+        entries.append(f'cypher;desc="{count} queries";dur={total * 1000:.1f}')
+    return ", ".join(entries)
@@ -1,23 +1,109 @@
-from flask import Blueprint, request, render_template, flash, redirect, url_for, send_from_directory
+from flask import Blueprint, request, render_template, flash, redirect, url_for, session, current_app, jsonify, abort, Response, stream_with_context
 from werkzeug.utils import secure_filename
 import os
 import json
+import hashlib
+import uuid
 
-from openapi_spec_validator import validate, OpenAPIV30SpecValidator, OpenAPIV31SpecValidator
-from openapi_spec_validator.readers import read_from_filename
-
-from .GraphGenerator import GraphGenerator
+from . import metrics
 from .SequenceGenerator import SequenceGenerator
+from .export import json_chunks, ndjson_chunks, gzip_chunks, value_chunks
+from .ResultCache import result_key
+from .validation import LEVELS
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 UPLOAD_FOLDER = os.path.join(basedir, 'uploads')
 ALLOWED_EXTENSIONS = {'json', 'yaml'}
+STATISTICS = {'ordering_count', 'preparation_count', 'dismantling_count', 'sequence_length', 'min_length', 'max_length'}
+TEMPLATES = {'object_list', 'object_crud', 'endpoint_list'}
 
 bp = Blueprint("openapi", __name__, url_prefix="/")
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
 
+def load_results(spec_hash):
+    ''' Function to get the cached results of a spec without the endpoint_list, they are generated and cached if needed.
+        Returns None if no graph exists '''
+    cache = current_app.extensions['result_cache']
+    results = cache.get(cache_key(spec_hash))
+    if results is None:
+        try:
+            results, endpoint_list = sequence_generator(graph_id(spec_hash)).iter_results()
+        except LookupError:
+            return None
+        cache.set(cache_key(spec_hash), results, endpoint_list)
+    return results
+
+def template_chunks(spec_hash, part):
+    ''' Function to get the json text of the info or a template of a spec in chunks, the endpoint_list is streamed from the
+        cache file or generated from the graph. Aborts with 404 if no graph exists '''
+    results = load_results(spec_hash)
+    if results is None:
+        abort(404)
+    if part != 'endpoint_list':
+        return value_chunks(results[part])
+    endpoint_list = current_app.extensions['result_cache'].endpoint_list(cache_key(spec_hash))
+    if endpoint_list is None:
+        # The file was already evicted again by other results, so the entries are generated endpoint by endpoint while streaming
+        try:
+            endpoint_list = sequence_generator(graph_id(spec_hash)).iter_endpoint_list()
+        except LookupError:
+            abort(404)
+    return json_chunks(endpoint_list)
+
+def cache_key(spec_hash):
+    ''' Function to get the result cache key and ETag prefix of a spec with the property depth of the app '''
+    return result_key(spec_hash, current_app.config['PROPERTY_DEPTH'])
+
+def graph_id(spec_hash):
+    ''' Function to get the namespace of the graph of a spec hash, uploads into a fixed namespace are stored under its name '''
+    return current_app.extensions['job_manager'].graph_id(spec_hash)
+
+def sequence_generator(graph_id, factorised=False):
+    ''' Function to create a SequenceGenerator for the graph in a namespace with the settings of the app '''
+    return SequenceGenerator(graph_id, current_app.extensions['graph_backend'], factorised=factorised, executor=current_app.extensions['sequence_pool'], max_depth=current_app.config['PROPERTY_DEPTH'])
+
+def spec_exists(spec_hash):
+    ''' Function to check without loading the graph if a spec hash is known, from its cached results or the graphs of the job manager '''
+    if current_app.extensions['result_cache'].get(cache_key(spec_hash)) is not None:
+        return True
+    return current_app.extensions['job_manager'].has_graph(spec_hash)
+
+def json_response(spec_hash, etag, create, filename=None):
+    ''' Function to answer with 304 if the client already has the version etag, else with the streamed json chunks of create().
+        The results of a spec hash never change, so create is only called if the client has no or another version.
+        The 304 is only sent for a known spec, for all others create() decides between the results and 404 '''
+    if request.if_none_match.contains_weak(etag) and spec_exists(spec_hash):
+        response = Response(status=304)
+    else:
+        chunks = create()
+        response = Response(stream_with_context(metrics.timed_chunks("export", chunks)), mimetype='application/json')
+        if filename is not None:
+            response.headers['Content-Disposition'] = f'attachment; filename={filename}'
+    # Clients keep the response, but ask again with If-None-Match before using it
+    response.set_etag(etag)
+    response.cache_control.no_cache = True
+    return response
+
+@bp.before_app_request
+def collect_request_metrics():
+    # Stages and queries of this request are collected for the Server-Timing header
+    if current_app.config['METRICS_DEBUG_HEADER']:
+        metrics.current_request.set(metrics.Metrics())
+
+@bp.after_app_request
+def add_server_timing(response):
+    collected = metrics.current_request.get()
+    if collected is not None:
+        response.headers['Server-Timing'] = metrics.server_timing(collected)
+        metrics.current_request.set(None)
+    return response
+
+@bp.route('/metrics')
+def metrics_text():
+    return Response(metrics.registry.to_prometheus(), mimetype='text/plain; version=0.0.4')
+
 @bp.route('/')
 def home():
     return redirect(url_for('openapi.upload'))
@@ -34,58 +120,191 @@ def upload():
             flash('No selected file')
             return redirect(request.url)
         if file and allowed_file(file.filename):
+            # Trusted uploads (e.g. from CI) can skip the full validation, an unknown level is rejected before anything is saved
+            validation = request.form.get('validation') or None
+            if validation is not None and validation not in LEVELS:
+                abort(400)
+
             filename = secure_filename(file.filename)
-            file.save(os.path.join(UPLOAD_FOLDER, filename))
-
-            # Check if the file is a valid 3.0/3.1 openapi_file
-            spec_dict, base_uri = read_from_filename(os.path.join(UPLOAD_FOLDER, filename))
-            openapi_version = spec_dict.get('openapi', '')
-
-            if openapi_version.startswith('3.0'):
-                validator_class = OpenAPIV30SpecValidator
-            elif openapi_version.startswith('3.1'):
-                validator_class = OpenAPIV31SpecValidator
-            else:
-                flash('Last uploaded file was not a valid 3.0/3.1 OpenAPI File')
-                return render_template('openapi/form.html')
-            try:
-                validate(spec_dict, cls=validator_class)
-            except:
-                flash('Last uploaded file was not a valid 3.0/3.1 OpenAPI File')
-                return render_template('openapi/form.html')
-
-            gg = GraphGenerator(os.path.join(UPLOAD_FOLDER, filename))
-            gg.create_graph()
- 
-            return redirect(url_for('openapi.details'))
+            # Save under a unique name, so concurrent uploads of the same file don't overwrite each other
+            path = os.path.join(UPLOAD_FOLDER, f'{uuid.uuid4().hex}_{filename}')
+            file.save(path)
+
+            # Parse, validate, ingest and generate the templates in the background. With a namespace the graph
+            # of the last upload into it is updated with only the changes
+            namespace = request.form.get('namespace', '').strip() or None
+            job = current_app.extensions['job_manager'].submit(path, filename, namespace, validation)
+            if request.accept_mimetypes.best == 'application/json':
+                return jsonify(job.to_dict()), 202
+            return redirect(url_for('openapi.job', job_id=job.id))
         
     return render_template('openapi/form.html')
 
+@bp.route('/jobs/<job_id>')
+def job(job_id):
+    job = current_app.extensions['job_manager'].get(job_id)
+    if job is None:
+        abort(404)
+
+    if job.stage == "failed":
+        flash(job.error)
+        return render_template('openapi/form.html')
+    if job.stage == "done":
+        # The spec hash keys the cached results, the graph id is the namespace of the graph
+        session['spec_hash'] = job.spec_hash
+        session['graph_id'] = job.graph_id
+        return redirect(url_for('openapi.details'))
+
+    return render_template('openapi/job.html', job=job.to_dict())
+
+@bp.route('/jobs/<job_id>/status')
+def job_status(job_id):
+    job = current_app.extensions['job_manager'].get(job_id)
+    if job is None:
+        abort(404)
+    return jsonify(job.to_dict())
+
+@bp.route('/jobs/<job_id>/download/<template>')
+def job_download(job_id, template):
+    job = current_app.extensions['job_manager'].get(job_id)
+    if job is None or template not in TEMPLATES:
+        abort(404)
+    if job.stage != "done":
+        return jsonify(job.to_dict()), 409
+
+    return json_response(job.spec_hash, f'{cache_key(job.spec_hash)}-{template}', lambda: template_chunks(job.spec_hash, template), f'{template}.json')
+
+@bp.route('/api/specs/<spec_hash>/<part>')
+def api_results(spec_hash, part):
+    # Read-only json of the API info or one template, independent of the session
+    if part != 'info' and part not in TEMPLATES:
+        abort(404)
+
+    def create():
+        # The info is only read from the graph if the templates are not cached
+        if part == 'info' and current_app.extensions['result_cache'].get(cache_key(spec_hash)) is None:
+            try:
+                return value_chunks(sequence_generator(graph_id(spec_hash)).get_api_info())
+            except LookupError:
+                abort(404)
+        return template_chunks(spec_hash, part)
+    filename = f'{part}.json' if request.args.get('download') else None
+    return json_response(spec_hash, f'{cache_key(spec_hash)}-{part}', create, filename)
+
+@bp.route('/api/specs/<spec_hash>/endpoints')
+def api_endpoint_sequences(spec_hash):
+    # endpoint_list entries of only the requested endpoints, e.g. ?name=/pets, get&name=/pets, post
+    names = list(dict.fromkeys(request.args.getlist('name')))
+    if not names:
+        abort(400)
+
+    def create():
+        # Take the entries from the cached endpoint_list, else create only the requested ones
+        cache = current_app.extensions['result_cache']
+        entries = cache.endpoint_entries(cache_key(spec_hash), names) if cache.get(cache_key(spec_hash)) is not None else None
+        if entries is not None:
+            if len(entries) < len(names):
+                abort(404)
+            return value_chunks({name: entries[name] for name in names})
+        try:
+            with metrics.stage("endpoint_sequences"):
+                return value_chunks(sequence_generator(graph_id(spec_hash)).get_endpoint_sequences(names))
+        except LookupError:
+            abort(404)
+    names_hash = hashlib.sha256(json.dumps(names).encode("utf-8")).hexdigest()[:16]
+    return json_response(spec_hash, f'{cache_key(spec_hash)}-endpoints-{names_hash}', create)
+
 @bp.route('/details', methods=['GET', 'POST'])
 def details():
-    sg = SequenceGenerator()
-    object = sg.get_infos()
+    if 'graph_id' not in session:
+        return redirect(url_for('openapi.upload'))
+
+    # The page only shows the info, the templates are created when they are downloaded
+    results = current_app.extensions['result_cache'].get(cache_key(session['spec_hash']))
+    if results is not None:
+        object = results['info']
+    else:
+        try:
+            object = sequence_generator(session['graph_id']).get_api_info()
+        except LookupError:
+            flash('The last uploaded file has to be uploaded again')
+            return redirect(url_for('openapi.upload'))
 
     if request.method == 'POST':
         button = request.form.get('button')
-        if button == 'object_crud':
-            result = sg.get_object_crud()
-            with open(os.path.join(UPLOAD_FOLDER, 'object_crud.json'), 'w') as output_file:
-                json.dump(result, output_file, indent = 4) 
-            return redirect(url_for('openapi.download_file', name='object_crud.json'))
-        elif button == 'object_list':
-            result = sg.get_object_list()
-            with open(os.path.join(UPLOAD_FOLDER, 'object_list.json'), 'w') as output_file:
-                json.dump(result, output_file, indent = 4) 
-            return redirect(url_for('openapi.download_file', name='object_list.json'))
+        # The templates are downloaded from the json api, nothing is written to the upload folder
+        if button in ('object_crud', 'object_list'):
+            return redirect(url_for('openapi.api_results', spec_hash=session['spec_hash'], part=button, download=1))
         elif button == 'endpoint_list':
-            result = sg.get_endpoint_list()
-            with open(os.path.join(UPLOAD_FOLDER, 'endpoint_list.json'), 'w') as output_file:
-                json.dump(result, output_file, indent = 4) 
-            return redirect(url_for('openapi.download_file', name='endpoint_list.json'))
+            return redirect(url_for('openapi.export_endpoint_list'))
+        elif button == 'endpoint_list_ndjson':
+            return redirect(url_for('openapi.export_endpoint_list', format='ndjson', compress='gzip'))
+        elif button == 'endpoint_statistics':
+            return redirect(url_for('openapi.export_endpoint_statistics', sort='sequence_length'))
 
     return render_template('openapi/details.html', object=object)
 
-@bp.route('/download/<name>')
-def download_file(name):
-    return send_from_directory(UPLOAD_FOLDER, name)
+@bp.route('/export/endpoint_list')
+def export_endpoint_list():
+    if 'graph_id' not in session:
+        return redirect(url_for('openapi.upload'))
+
+    # The cache holds the expanded sequences, the factorised form is always generated while streaming
+    factorised = request.args.get('sequences') == 'factorised'
+
+    # Stream the cached endpoint_list from its file, or generate it endpoint by endpoint while streaming
+    cache = current_app.extensions['result_cache']
+    items = None
+    if not factorised and cache.get(cache_key(session['spec_hash'])) is not None:
+        items = cache.endpoint_list(cache_key(session['spec_hash']))
+    if items is None:
+        sg = sequence_generator(session['graph_id'], factorised=factorised)
+        try:
+            sg.get_infos(endpoint_list=False)
+        except LookupError:
+            flash('The last uploaded file has to be uploaded again')
+            return redirect(url_for('openapi.upload'))
+        items = sg.iter_endpoint_list()
+
+    # json like the other downloads or ndjson with one endpoint per line, optionally gzip compressed
+    if request.args.get('format') == 'ndjson':
+        chunks = ndjson_chunks(items)
+        mimetype = 'application/x-ndjson'
+        filename = 'endpoint_list.ndjson'
+    else:
+        chunks = json_chunks(items)
+        mimetype = 'application/json'
+        filename = 'endpoint_list.json'
+    headers = {'Content-Disposition': f'attachment; filename={filename}'}
+    if request.args.get('compress') == 'gzip':
+        chunks = gzip_chunks(chunks)
+        headers['Content-Encoding'] = 'gzip'
+
+    return Response(stream_with_context(metrics.timed_chunks("export", chunks)), mimetype=mimetype, headers=headers)
+
+@bp.route('/export/endpoint_statistics')
+def export_endpoint_statistics():
+    if 'graph_id' not in session:
+        return redirect(url_for('openapi.upload'))
+
+    # The statistics are calculated without generating any sequence, so they are not cached
+    sg = sequence_generator(session['graph_id'])
+    try:
+        sg.get_infos(endpoint_list=False)
+    except LookupError:
+        flash('The last uploaded file has to be uploaded again')
+        return redirect(url_for('openapi.upload'))
+
+    # Rank the endpoints by one of the metrics, most expensive first
+    items = sg.iter_endpoint_statistics()
+    sort = request.args.get('sort')
+    if sort is not None:
+        if sort not in STATISTICS:
+            abort(400)
+        items = sorted(items, key=lambda item: item[1][sort], reverse=True)
+
+    return Response(
+        stream_with_context(metrics.timed_chunks("export", json_chunks(items))),
+        mimetype='application/json',
+        headers={'Content-Disposition': 'attachment; filename=endpoint_statistics.json'}
+    )
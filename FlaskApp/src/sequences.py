@@ -0,0 +1,262 @@
+from itertools import islice
+import math
+
+def object_orderings(objects, dependencies, limit=None):
+    ''' Generator for all orders of objects in which every dependency (before, after) is kept.
+        The orders are yielded in the same sequence as filtering itertools.permutations would, at most limit orders '''
+    orderings = _backtrack(objects, dependencies)
+    if limit is not None:
+        orderings = islice(orderings, limit)
+    return orderings
+
+def count_object_orderings(objects, dependencies):
+    ''' Function to count all orders of objects in which every dependency is kept, without creating them '''
+    return ordering_counter(objects, dependencies)()
+
+def ordering_counter(objects, dependencies):
+    ''' Function to get a function which counts the orders of objects beginning with the given objects.
+        All counts share one table of the orders per set of already placed objects '''
+    index = {object: count for count, object in enumerate(objects)}
+    # Bitmask of all objects which have to be placed before the object
+    predecessors = [0] * len(objects)
+    for before, after in dependencies:
+        if before != after:
+            predecessors[index[after]] |= 1 << index[before]
+
+    full = (1 << len(objects)) - 1
+    counts = {full: 1}
+
+    def count(placed):
+        if placed not in counts:
+            counts[placed] = sum(
+                count(placed | 1 << i)
+                for i in range(len(objects))
+                if not placed & 1 << i and predecessors[i] & placed == predecessors[i]
+            )
+        return counts[placed]
+
+    def count_beginning_with(*first):
+        placed = 0
+        for object in first:
+            i = index[object]
+            if placed & 1 << i or predecessors[i] & placed != predecessors[i]:
+                return 0
+            placed |= 1 << i
+        return count(placed)
+
+    return count_beginning_with
+
+def endpoint_entry(task):
+    ''' Function to create the endpoint_list entry of one endpoint from the task of SequenceGenerator.
+        It only gets plain data and is defined on module level, so it can run in a worker process '''
+    connected_with_objects = task["connected_with_objects"]
+    dependencies = task["dependencies"]
+
+    # In count only mode the sequence_length of all orders is calculated from the number of orders, without creating one
+    if task["count_only"]:
+        count_orderings = ordering_counter(connected_with_objects, dependencies)
+        return {
+            "connected_with_objects": connected_with_objects,
+            "preparation": [],
+            "dismantling": [],
+            "sequence_length": sum(
+                groups_length(sequence_groups(connected_with_objects, count_orderings, task["crud_endpoint"], task["object_crud"], crud_type))
+                for crud_type in ("create", "delete")
+            ),
+            "ordering_count": count_orderings()
+        }
+
+    # Create only the orders of objects which fit all dependencies
+    paths = object_orderings(connected_with_objects, dependencies, task["max_orderings"])
+
+    # Iterate through all valid object paths and create the sequences in factorised form
+    preparation_sets = []
+    dismantling_sets = []
+    for path in paths:
+        preparation_set, dismantling_set = factorise_sequences(path, task["crud_endpoint"], task["object_crud"])
+        preparation_sets.append(preparation_set)
+        dismantling_sets.append(dismantling_set)
+
+    # Calculate sequence_length from the number and the lengths of the sequences without expanding them
+    sequence_length = average_length(preparation_sets) + average_length(dismantling_sets)
+
+    # Expand the sequences only if the factorised form was not requested
+    if task["factorised"]:
+        preparation = preparation_sets
+        dismantling = dismantling_sets
+    else:
+        preparation = [sequence for preparation_set in preparation_sets for sequence in expand_sequences(preparation_set)]
+        dismantling = [sequence for dismantling_set in dismantling_sets for sequence in expand_sequences(dismantling_set)]
+    result = {
+        "connected_with_objects": connected_with_objects,
+        "preparation": preparation,
+        "dismantling": dismantling,
+        "sequence_length": sequence_length
+    }
+    # If the orders are limited save how many orders exist in total
+    if task["max_orderings"] is not None:
+        result["ordering_count"] = count_object_orderings(connected_with_objects, dependencies)
+
+    return result
+
+def sequence_groups(objects, count_orderings, crud_endpoint, object_crud, crud_type):
+    ''' Function to get the preparation (create) or dismantling (delete) sequences of all object orders
+        as groups of (number of object orders, sequences per order, length of these sequences) '''
+    if crud_endpoint is not None and crud_endpoint[0] not in objects:
+        crud_endpoint = None
+    # The object the endpoint creates has no preparation, the object it deletes has no dismantling
+    skipped = crud_endpoint[0] if crud_endpoint is not None and crud_endpoint[1] == crud_type else None
+    other = crud_endpoint[0] if crud_endpoint is not None and crud_endpoint[1] != crud_type else None
+    included = [object for object in objects if object != skipped]
+    if not included:
+        return []
+
+    alternatives = {object: max(1, len(object_crud[object][crud_type])) for object in included}
+    sequences = math.prod(alternatives.values())
+    length = len(included)
+    total = count_orderings()
+
+    if crud_type == "create" or crud_endpoint is None:
+        return [(total, sequences, length)]
+    # If the deleted object comes first there is no preparation yet and the dismantling sequences are never extended
+    if skipped is not None:
+        return [(total - count_orderings(skipped), sequences, length)]
+    # If the created object comes first, the first two objects both begin dismantling sequences of their own
+    groups = [(total - count_orderings(other), sequences, length)]
+    if length == 1:
+        groups.append((count_orderings(other), sequences, length))
+        return groups
+    for second in included:
+        if second != other:
+            second_sequences = sequences // (alternatives[other] * alternatives[second]) * (alternatives[other] + alternatives[second])
+            groups.append((count_orderings(other, second), second_sequences, length - 1))
+    return groups
+
+def groups_length(groups):
+    ''' Function to get the rounded up average length of the sequences of groups, like average_length of the expanded sequences '''
+    count = sum(orderings * sequences for orderings, sequences, length in groups)
+    total_length = sum(orderings * sequences * length for orderings, sequences, length in groups)
+    return math.ceil(total_length / count) if count > 0 else 0
+
+def factorise_sequences(path, crud_endpoint, object_crud):
+    ''' Function to get the preparation and dismantling sequences of one object order in factorised form,
+        the objects in order with the alternative create/delete endpoints of every object '''
+    preparation = {"objects": [], "alternatives": [], "starts": 0}
+    dismantling = {"objects": [], "alternatives": [], "starts": 0}
+    for object in path:
+        # Until the first object of the preparation is added, every object begins sequences of its own
+        starting = not preparation["objects"]
+        # preparation
+        if crud_endpoint == None or crud_endpoint[1] == "delete" or crud_endpoint[0] != object:
+            _add_position(preparation, object, object_crud[object]["create"], starting)
+        # dismantling
+        if crud_endpoint == None or crud_endpoint[1] == "create" or crud_endpoint[0] != object:
+            _add_position(dismantling, object, object_crud[object]["delete"], starting)
+    return preparation, dismantling
+
+def average_length(factorised_sets):
+    ''' Function to get the rounded up average length of all sequences of factorised sequence sets '''
+    count = 0
+    total_length = 0
+    for factorised in factorised_sets:
+        set_count, set_length = count_sequences(factorised)
+        count = count + set_count
+        total_length = total_length + set_length
+    return math.ceil(total_length / count) if count > 0 else 0
+
+def _add_position(factorised, object, methods, starting):
+    ''' Function to add an object with its alternative endpoints, or a placeholder if there are none '''
+    factorised["objects"].append(object)
+    factorised["alternatives"].append(list(methods) if methods else [f'Placeholder<{object}>'])
+    if starting:
+        factorised["starts"] = factorised["starts"] + 1
+
+def expand_sequences(factorised):
+    ''' Generator for the concrete sequences of one factorised sequence set, in the order the list based expansion created them.
+        The first "starts" positions begin sequences of their own, every following position extends all sequences with its alternatives.
+        The sequences are created one after another, the prefixes are walked again for every position with more than one alternative '''
+    alternatives = factorised["alternatives"]
+    starts = factorised["starts"]
+
+    # Every position with more than one alternative begins a group, the following positions with one alternative only extend it
+    groups = [(None, [])]
+    for position_alternatives in alternatives[starts:]:
+        if len(position_alternatives) > 1:
+            groups.append((position_alternatives, []))
+        else:
+            groups[-1][1].extend(position_alternatives)
+
+    sequence = []
+
+    def walk(level):
+        # Yields every time sequence holds the next prefix up to the group level, which is removed again afterwards
+        group_alternatives, following = groups[level]
+        if level == 0:
+            for start_alternatives in alternatives[:starts]:
+                for alternative in start_alternatives:
+                    sequence.append(alternative)
+                    sequence.extend(following)
+                    yield
+                    sequence.clear()
+            return
+        first, *others = group_alternatives
+        # The first alternative extends every prefix, the copies with the other alternatives follow after all of them
+        for _ in walk(level - 1):
+            size = len(sequence)
+            sequence.append(first)
+            sequence.extend(following)
+            yield
+            del sequence[size:]
+        for _ in walk(level - 1):
+            size = len(sequence)
+            for alternative in others:
+                sequence.append(alternative)
+                sequence.extend(following)
+                yield
+                del sequence[size:]
+
+    for _ in walk(len(groups) - 1):
+        yield list(sequence)
+
+def count_sequences(factorised):
+    ''' Function to get the number of concrete sequences and the sum of their lengths without expanding them '''
+    alternatives = factorised["alternatives"]
+    starts = factorised["starts"]
+    count = sum(len(start_alternatives) for start_alternatives in alternatives[:starts])
+    total_length = count
+    for position_alternatives in alternatives[starts:]:
+        total_length = len(position_alternatives) * (total_length + count)
+        count = len(position_alternatives) * count
+    return count, total_length
+
+def _backtrack(objects, dependencies):
+    ''' Generator for a backtracking topological sort, which tries the free objects in their original order '''
+    index = {object: count for count, object in enumerate(objects)}
+    successors = [[] for _ in objects]
+    indegree = [0] * len(objects)
+    for before, after in dependencies:
+        if before != after:
+            successors[index[before]].append(index[after])
+            indegree[index[after]] += 1
+
+    order = []
+    placed = [False] * len(objects)
+
+    def extend():
+        if len(order) == len(objects):
+            yield tuple(objects[i] for i in order)
+            return
+        for i in range(len(objects)):
+            if placed[i] or indegree[i]:
+                continue
+            placed[i] = True
+            order.append(i)
+            for successor in successors[i]:
+                indegree[successor] -= 1
+            yield from extend()
+            for successor in successors[i]:
+                indegree[successor] += 1
+            order.pop()
+            placed[i] = False
+
+    return extend()
@@ -0,0 +1,70 @@
+from openapi_spec_validator import validate, OpenAPIV30SpecValidator, OpenAPIV31SpecValidator
+
+from .GraphGenerator import OPERATIONS
+
+# Validation levels of an upload: the full jsonschema validation, only the parts GraphGenerator reads, or none
+LEVELS = ("full", "structural", "off")
+INVALID = 'Last uploaded file was not a valid 3.0/3.1 OpenAPI File'
+
+def validate_spec(spec_dict, level="full"):
+    ''' Function to check if a parsed file is a valid 3.0/3.1 openapi_file on the given level, raises ValueError if not '''
+    if level == "off":
+        return
+    if not isinstance(spec_dict, dict):
+        raise ValueError(INVALID)
+    openapi_version = spec_dict.get('openapi', '')
+    if not isinstance(openapi_version, str):
+        raise ValueError(INVALID)
+    if openapi_version.startswith('3.0'):
+        validator_class = OpenAPIV30SpecValidator
+    elif openapi_version.startswith('3.1'):
+        validator_class = OpenAPIV31SpecValidator
+    else:
+        raise ValueError(INVALID)
+
+    if level == "structural":
+        if not is_structural_valid(spec_dict):
+            raise ValueError(INVALID)
+        return
+    try:
+        validate(spec_dict, cls=validator_class)
+    except Exception:
+        raise ValueError(INVALID)
+
+def is_structural_valid(spec_dict):
+    ''' Function to check only the shapes GraphGenerator reads: info, components/schemas and the operations of all paths '''
+    info = spec_dict.get('info')
+    if not isinstance(info, dict) or 'title' not in info or 'version' not in info:
+        return False
+
+    schemas = spec_dict.get('components', {})
+    if not isinstance(schemas, dict):
+        return False
+    schemas = schemas.get('schemas', {})
+    if not isinstance(schemas, dict) or not all(isinstance(schema, dict) for schema in schemas.values()):
+        return False
+
+    paths = spec_dict.get('paths', {})
+    if not isinstance(paths, dict):
+        return False
+    for path, operations in paths.items():
+        if not isinstance(path, str) or not path.startswith('/') or not isinstance(operations, dict):
+            return False
+        for operation_name, operation_details in operations.items():
+            # Path level entries like summary, servers or parameters are no operations and are skipped by GraphGenerator
+            if operation_name not in OPERATIONS:
+                continue
+            if not isinstance(operation_details, dict):
+                return False
+            parameters = operation_details.get('parameters', [])
+            if not isinstance(parameters, list):
+                return False
+            for parameter in parameters:
+                if not isinstance(parameter, dict):
+                    return False
+                if '$ref' not in parameter and not ('name' in parameter and 'in' in parameter):
+                    return False
+            for key in ('requestBody', 'responses'):
+                if not isinstance(operation_details.get(key, {}), dict):
+                    return False
+    return True
@@ -0,0 +1,136 @@
+''' Port of the original permutation based endpoint_list, the reference the optimised generation is compared with '''
+from itertools import permutations
+import math
+
+def property_paths(graph, object_name):
+    ''' All HAS_PROPERTY paths to Objects without properties, longest first. Like the variable-length match in Cypher
+        every relationship is used at most once per path '''
+    paths = []
+
+    def expand(path, used):
+        for index, property_object in enumerate(graph.has_property[path[-1]]):
+            relationship = (path[-1], index)
+            if relationship in used:
+                continue
+            next_path = path + [property_object]
+            if not graph.has_property[property_object]:
+                paths.append(next_path)
+            expand(next_path, used | {relationship})
+
+    expand([object_name], frozenset())
+    paths.sort(key=len, reverse=True)
+    return paths
+
+def object_crud(graph):
+    ''' object_crud without the NO_OBJECT entry '''
+    result = {}
+    for object_name in graph.objects:
+        result[object_name] = {"create": [], "read": [], "update": [], "delete": []}
+        finished_endpoints = []
+        for relationship in graph.object_relationships[object_name]:
+            endpoint_name = relationship['endpoint']
+            operation = graph.endpoints[endpoint_name]['operation']
+            if endpoint_name in finished_endpoints:
+                continue
+            if operation == "post" and relationship['type'] in ("IN_REQUEST_BODY", "IS_PARAMETER"):
+                result[object_name]["create"].append(endpoint_name)
+            elif operation == "get" and relationship['type'] == "IN_RESPONSE_BODY":
+                result[object_name]["read"].append(endpoint_name)
+            elif operation in ("put", "patch"):
+                result[object_name]["update"].append(endpoint_name)
+            elif operation == "delete":
+                result[object_name]["delete"].append(endpoint_name)
+            else:
+                continue
+            finished_endpoints.append(endpoint_name)
+    return result
+
+def crud_endpoint(endpoint_name, crud):
+    ''' Create/delete role of an endpoint, the first Object wins '''
+    for object_name, crud_details in crud.items():
+        if endpoint_name in crud_details['create']:
+            return (object_name, "create")
+        if endpoint_name in crud_details['delete']:
+            return (object_name, "delete")
+    return None
+
+def endpoint_dependencies(graph, endpoint_name):
+    ''' Connected Objects and dependency tuples of an endpoint '''
+    connected_with_objects = []
+    paths = []
+    for relationship in graph.endpoint_relationships[endpoint_name]:
+        if relationship['object'] in connected_with_objects:
+            continue
+        connected_with_objects.append(relationship['object'])
+        property_objects = property_paths(graph, relationship['object'])
+        if property_objects:
+            for path in property_objects:
+                paths.append(path[::-1])
+                for object_name in path:
+                    if object_name not in connected_with_objects:
+                        connected_with_objects.append(object_name)
+        else:
+            paths.append([relationship['object']])
+
+    dependencies = []
+    for path in paths:
+        for count in range(len(path) - 1):
+            if (path[count], path[count + 1]) not in dependencies:
+                dependencies.append((path[count], path[count + 1]))
+    return connected_with_objects, dependencies
+
+def orderings(objects, dependencies):
+    ''' All permutations which keep every dependency '''
+    return [
+        ordering for ordering in permutations(objects)
+        if all(ordering.index(before) <= ordering.index(after) for before, after in dependencies)
+    ]
+
+def sequences(path, crud_endpoint, crud):
+    ''' Preparation and dismantling sequences of one object order, built with the original list copies '''
+    preparation = []
+    dismantling = []
+    for object_name in path:
+        count = len(preparation)
+        for kind, sequences_list, skip in (("create", preparation, "create"), ("delete", dismantling, "delete")):
+            if crud_endpoint is not None and crud_endpoint[1] == skip and crud_endpoint[0] == object_name:
+                continue
+            methods = crud[object_name][kind] or [f'Placeholder<{object_name}>']
+            if count == 0:
+                sequences_list.extend([method] for method in methods)
+            else:
+                copies = []
+                for sequence in sequences_list:
+                    prefix = sequence.copy()
+                    sequence.append(methods[0])
+                    copies.extend(prefix + [method] for method in methods[1:])
+                sequences_list.extend(copies)
+    return preparation, dismantling
+
+def average_length(sequences_list):
+    ''' Rounded up average length '''
+    return math.ceil(sum(len(sequence) for sequence in sequences_list) / len(sequences_list)) if sequences_list else 0
+
+def endpoint_entry(objects, dependencies, crud_endpoint, crud):
+    ''' endpoint_list entry of one endpoint from all valid permutations '''
+    preparation = []
+    dismantling = []
+    for path in orderings(objects, dependencies):
+        path_preparation, path_dismantling = sequences(path, crud_endpoint, crud)
+        preparation = preparation + path_preparation
+        dismantling = dismantling + path_dismantling
+    return {
+        "connected_with_objects": objects,
+        "preparation": preparation,
+        "dismantling": dismantling,
+        "sequence_length": average_length(preparation) + average_length(dismantling)
+    }
+
+def endpoint_list(graph):
+    ''' endpoint_list of a GraphSnapshot '''
+    crud = object_crud(graph)
+    result = {}
+    for endpoint_name in graph.endpoints:
+        objects, dependencies = endpoint_dependencies(graph, endpoint_name)
+        result[endpoint_name] = endpoint_entry(objects, dependencies, crud_endpoint(endpoint_name, crud), crud)
+    return result
@@ -0,0 +1,21 @@
+import pytest
+
+from src.GraphBackend import create_backend, backend_config
+from src.database import LOOKUPS
+
+@pytest.fixture(scope="module")
+def neo4j_backend():
+    ''' Neo4jBackend for NEO4J_URI, the tests are skipped if no database is reachable '''
+    pytest.importorskip("neo4j")
+    backend = create_backend(backend_config("neo4j"))
+    try:
+        backend.driver.verify_connectivity()
+    except Exception as error:
+        backend.close()
+        pytest.skip(f'Neo4j is not available: {error}')
+    yield backend
+    backend.close()
+
+def test_lookups_use_an_index_seek(neo4j_backend):
+    # The schema is created on the first use of the driver, every lookup has to be planned without a label scan
+    assert neo4j_backend.explain_lookups() == {lookup: True for lookup in LOOKUPS}
@@ -0,0 +1,163 @@
+import json
+import os
+
+import pytest
+import yaml
+
+from benchmarks.specgen import generate_spec
+from src.GraphGenerator import GraphGenerator
+from src.MemoryBackend import MemoryBackend
+from src.SequenceGenerator import SequenceGenerator
+from src.validation import validate_spec
+
+import legacy
+
+PETSTORE = os.path.join(os.path.dirname(__file__), "..", "src", "uploads", "openapi_petstore.yaml")
+
+# Layered schemas with one or more create/delete alternatives per schema and different numbers of operations
+SPECS = [
+    {"schemas": 6, "fan_out": 2, "depth": 3, "paths": 8, "operations": 3, "crud": 1, "seed": 0},
+    {"schemas": 5, "fan_out": 2, "depth": 2, "paths": 10, "operations": 5, "crud": 2, "seed": 1},
+    {"schemas": 8, "fan_out": 3, "depth": 3, "paths": 6, "operations": 2, "crud": 0, "seed": 2},
+    {"schemas": 4, "fan_out": 1, "depth": 4, "paths": 8, "operations": 4, "crud": 1, "seed": 3},
+]
+
+def stored_graph(backend, spec_id):
+    ''' Nodes and relationships of a namespace in their stored order, without the namespace '''
+    stored = backend.graphs[spec_id]
+    return json.loads(json.dumps(stored).replace(f'"{spec_id}"', '"spec"'))
+
+def pipeline(spec):
+    ''' Backend with the graph of the spec and the results of SequenceGenerator '''
+    backend = MemoryBackend()
+    GraphGenerator(spec, "spec", backend).create_graph()
+    return backend, SequenceGenerator("spec", backend).get_results()
+
+@pytest.mark.parametrize("options", SPECS)
+def test_pipeline_matches_the_permutation_algorithm(options):
+    backend, results = pipeline(generate_spec(**options))
+    graph = backend.load_graph("spec")
+    assert json.dumps(results["endpoint_list"]) == json.dumps(legacy.endpoint_list(graph))
+    assert {object_name: crud for object_name, crud in results["object_crud"].items() if object_name != "NO_OBJECT"} == legacy.object_crud(graph)
+
+def test_pipeline_matches_the_permutation_algorithm_for_the_petstore():
+    with open(PETSTORE, "r") as file:
+        backend, results = pipeline(yaml.safe_load(file))
+    assert json.dumps(results["endpoint_list"]) == json.dumps(legacy.endpoint_list(backend.load_graph("spec")))
+
+def test_delete_graph_only_deletes_its_namespace():
+    backend = MemoryBackend()
+    GraphGenerator(generate_spec(schemas=4, paths=4), "first", backend).create_graph()
+    GraphGenerator(generate_spec(schemas=4, paths=4), "second", backend).create_graph()
+    backend.delete_graph("first")
+    assert not backend.load_graph("first").info
+    assert backend.load_graph("second").objects == [f'Entity{index}' for index in range(4)]
+
+def test_update_graph_keeps_the_order_of_a_fresh_graph():
+    base = generate_spec(schemas=6, depth=2, paths=6, seed=3)
+    changed = generate_spec(schemas=6, depth=2, paths=6, seed=3)
+    # A new schema and a new path in front of the existing ones, and a removed property
+    changed["components"]["schemas"] = {
+        "Archive": {"type": "object", "properties": {"entity0": {"$ref": "#/components/schemas/Entity0"}}},
+        **changed["components"]["schemas"]
+    }
+    changed["paths"] = {
+        "/archives": {"post": {"requestBody": {"content": {"application/json": {"schema": {"$ref": "#/components/schemas/Archive"}}}}, "responses": {"204": {"description": "no content"}}}},
+        **changed["paths"]
+    }
+    changed["components"]["schemas"]["Entity1"]["properties"].popitem()
+
+    backend = MemoryBackend()
+    GraphGenerator(base, "updated", backend).update_graph()
+    diff = GraphGenerator(changed, "updated", backend).update_graph()
+    GraphGenerator(changed, "fresh", backend).create_graph()
+
+    assert diff["added"]["objects"] == [{"name": "Archive"}]
+    # Compared as json text, so the order of the nodes and relationships counts
+    assert json.dumps(stored_graph(backend, "updated")) == json.dumps(stored_graph(backend, "fresh"))
+    assert json.dumps(SequenceGenerator("updated", backend).get_results()) == json.dumps(SequenceGenerator("fresh", backend).get_results())
+
+def test_path_level_entries_are_no_endpoints():
+    spec = generate_spec(schemas=2, paths=2, operations=2, crud=0)
+    spec["paths"]["/entity0s"].update({
+        "summary": "Entities",
+        "servers": [{"url": "/v2"}],
+        "parameters": [{"name": "filter", "in": "query", "schema": {"type": "string"}}],
+        "x-owner": {"team": "api"}
+    })
+    validate_spec(spec, "structural")
+    backend, results = pipeline(spec)
+    assert list(results["endpoint_list"]) == ["/entity0s, post", "/entity0s, get", "/entity0s/{id}, get", "/entity0s/{id}, delete"]
+
+def schema_ref(schema_name):
+    return {"$ref": f"#/components/schemas/{schema_name}"}
+
+def create_operation(schema_name):
+    return {"requestBody": {"content": {"application/json": {"schema": schema_ref(schema_name)}}}, "responses": {"201": {"description": "created"}}}
+
+# A self-referencing tree and a User/Team cycle, which ends at the Address of the User
+RECURSIVE = {
+    "openapi": "3.0.3",
+    "info": {"title": "Recursive", "version": "1.0"},
+    "paths": {
+        "/tags": {"post": create_operation("Tag")},
+        "/nodes": {"post": create_operation("Node")},
+        "/addresses": {"post": create_operation("Address")},
+        "/users": {"post": create_operation("User")},
+        "/teams": {"post": create_operation("Team")}
+    },
+    "components": {"schemas": {
+        "Tag": {"type": "object", "properties": {"label": {"type": "string"}}},
+        "Node": {"type": "object", "properties": {"parent": schema_ref("Node"), "children": {"type": "array", "items": schema_ref("Node")}, "tag": schema_ref("Tag")}},
+        "Address": {"type": "object", "properties": {"street": {"type": "string"}}},
+        "User": {"type": "object", "properties": {"team": schema_ref("Team"), "address": schema_ref("Address")}},
+        "Team": {"type": "object", "properties": {"members": {"type": "array", "items": schema_ref("User")}}}
+    }}
+}
+
+def test_cycles_are_condensed():
+    backend, results = pipeline(RECURSIVE)
+    graph = backend.load_graph("spec")
+    assert graph.has_property["Node"] == ["Node", "Node", "Tag"]
+
+    # The objects of a cycle follow each other once in node order, from either of them
+    assert graph.property_paths("Node") == [["Node", "Tag"]]
+    assert graph.property_paths("User") == graph.property_paths("Team") == [["User", "Team", "Address"]]
+    assert graph.property_paths("Address") == []
+
+    endpoint_list = results["endpoint_list"]
+    assert endpoint_list["/nodes, post"] == {
+        "connected_with_objects": ["Node", "Tag"],
+        "preparation": [["/tags, post"]],
+        "dismantling": [["Placeholder<Tag>", "Placeholder<Node>"]],
+        "sequence_length": 3
+    }
+    assert endpoint_list["/users, post"] == {
+        "connected_with_objects": ["User", "Team", "Address"],
+        "preparation": [["/addresses, post", "/teams, post"]],
+        "dismantling": [["Placeholder<Address>", "Placeholder<Team>", "Placeholder<User>"]],
+        "sequence_length": 5
+    }
+    assert endpoint_list["/teams, post"]["connected_with_objects"] == ["Team", "User", "Address"]
+    assert endpoint_list["/teams, post"]["preparation"] == [["/addresses, post", "/users, post"]]
+
+def test_max_depth_limits_the_property_paths():
+    backend = MemoryBackend()
+    GraphGenerator(RECURSIVE, "spec", backend).create_graph()
+    graph = backend.load_graph("spec")
+
+    # A cycle counts as one step
+    assert graph.property_paths("User", 1) == [["User", "Team"]]
+    assert graph.property_paths("User", 2) == graph.property_paths("User") == [["User", "Team", "Address"]]
+    assert graph.property_paths("Node", 1) == []
+    assert graph.property_paths("Node", 2) == [["Node", "Tag"]]
+
+    endpoint_list = SequenceGenerator("spec", backend, max_depth=1).get_results()["endpoint_list"]
+    assert endpoint_list["/nodes, post"]["connected_with_objects"] == ["Node"]
+    assert endpoint_list["/users, post"] == {
+        "connected_with_objects": ["User", "Team"],
+        "preparation": [["/teams, post"]],
+        "dismantling": [["Placeholder<Team>", "Placeholder<User>"]],
+        "sequence_length": 3
+    }
+    assert endpoint_list["/teams, post"]["connected_with_objects"] == ["Team", "User"]
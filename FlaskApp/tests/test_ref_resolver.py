@@ -0,0 +1,91 @@
+from src.GraphGenerator import GraphGenerator
+from src.MemoryBackend import MemoryBackend
+from src.RefResolver import RefResolver
+
+def ref(part, name):
+    return {"$ref": f"#/components/{part}/{name}"}
+
+def schema_ref(schema_name):
+    return ref("schemas", schema_name)
+
+# allOf, oneOf/anyOf, refs to the other components, cyclic refs and an inline object
+SPEC = {
+    "openapi": "3.0.3",
+    "info": {"title": "Refs", "version": "1.0"},
+    "paths": {
+        "/pets": {
+            "post": {"requestBody": ref("requestBodies", "PetBody"), "responses": {"201": ref("responses", "Animal")}},
+            "get": {
+                "parameters": [ref("parameters", "name"), ref("parameters", "id")],
+                "responses": {"200": {"description": "pets", "content": {"application/json": {"schema": {"type": "array", "items": {"anyOf": [schema_ref("Cat"), schema_ref("Dog")]}}}}}}
+            }
+        },
+        "/nodes": {"post": {"requestBody": {"content": {"application/json": {"schema": schema_ref("Node")}}}, "responses": {"204": {"description": "created"}}}}
+    },
+    "components": {
+        "schemas": {
+            "Base": {"type": "object", "properties": {"id": {"type": "integer"}, "owner": schema_ref("Owner")}},
+            "Owner": {"type": "object", "properties": {"name": {"type": "string"}}},
+            "Pet": {"allOf": [schema_ref("Base"), {"type": "object", "properties": {
+                "name": {"type": "string"},
+                "kind": {"oneOf": [schema_ref("Cat"), schema_ref("Dog")]},
+                "toys": {"type": "array", "items": {"anyOf": [schema_ref("Toy"), schema_ref("Ball")]}},
+                "details": {"type": "object", "properties": {"vet": schema_ref("Vet")}}
+            }}]},
+            "Cat": {"type": "object", "properties": {"indoor": {"type": "boolean"}}},
+            "Dog": {"type": "object", "properties": {"breed": {"type": "string"}}},
+            "Toy": {"type": "object", "properties": {"label": {"type": "string"}}},
+            "Ball": {"type": "object", "properties": {"size": {"type": "integer"}}},
+            "Vet": {"type": "object", "properties": {"name": {"type": "string"}}},
+            "Node": {"allOf": [schema_ref("Node"), {"type": "object", "properties": {"next": schema_ref("Node"), "alias": schema_ref("Alias")}}]},
+            "Alias": schema_ref("Loop"),
+            "Loop": schema_ref("Alias")
+        },
+        "parameters": {
+            "name": {"name": "name", "in": "query", "schema": {"type": "string"}},
+            "id": ref("parameters", "petId"),
+            "petId": {"name": "id", "in": "query", "schema": {"type": "integer"}}
+        },
+        "requestBodies": {"PetBody": {"content": {"application/json": {"schema": schema_ref("Pet")}}}},
+        "responses": {"Animal": {"description": "animal", "content": {"application/json": {"schema": {"oneOf": [schema_ref("Cat"), schema_ref("Dog")]}}}}}
+    }
+}
+
+def test_resolver():
+    resolver = RefResolver(SPEC)
+    # allOf parts are merged in order, cyclic refs and cyclic allOf parts end at an empty schema
+    assert list(resolver.properties(schema_ref("Pet"))) == ["id", "owner", "name", "kind", "toys", "details"]
+    assert list(resolver.properties(schema_ref("Node"))) == ["next", "alias"]
+    assert resolver.resolve(schema_ref("Alias")) == resolver.resolve(schema_ref("Loop")) == {}
+    assert resolver.resolve(ref("parameters", "id"))["name"] == "id"
+    assert resolver.resolve({"$ref": "other.yaml#/components/schemas/Pet"}) == {}
+
+def test_graph_of_all_constructs():
+    backend = MemoryBackend()
+    GraphGenerator(SPEC, "spec", backend).create_graph()
+    graph = backend.load_graph("spec").to_graph()
+
+    # The inline object is added after the component schemas
+    assert [object["name"] for object in graph["objects"]] == ["Base", "Owner", "Pet", "Cat", "Dog", "Toy", "Ball", "Vet", "Node", "Alias", "Loop", "Pet.details"]
+    assert [(row["from"], row["to"], row["name"], row["list"]) for row in graph["has_property"]] == [
+        ("Base", "Owner", "owner", False),
+        ("Pet", "Owner", "owner", False),
+        ("Pet", "Cat", "kind", False),
+        ("Pet", "Dog", "kind", False),
+        ("Pet", "Toy", "toys", True),
+        ("Pet", "Ball", "toys", True),
+        ("Pet", "Pet.details", "details", False),
+        ("Node", "Node", "next", False),
+        ("Node", "Alias", "alias", False),
+        ("Pet.details", "Vet", "vet", False)
+    ]
+
+    # requestBodies, parameters and responses are read through their refs
+    assert [(row["endpoint"], row["object"]) for row in graph["request_body"]] == [("/pets, post", "Pet"), ("/nodes, post", "Node")]
+    assert [(row["endpoint"], row["object"], row["parameter_name"]) for row in graph["parameters"]] == [("/pets, get", "Pet", "name"), ("/pets, get", "Pet", "id")]
+    assert [(row["endpoint"], row["object"], row["status_code"]) for row in graph["responses"]] == [
+        ("/pets, post", "Cat", "201"),
+        ("/pets, post", "Dog", "201"),
+        ("/pets, get", "Cat", "200"),
+        ("/pets, get", "Dog", "200")
+    ]
@@ -0,0 +1,145 @@
+import io
+import json
+import os
+import time
+
+import pytest
+import yaml
+
+from benchmarks.specgen import generate_spec
+from src import create_app
+from src.SequenceGenerator import SequenceGenerator
+
+@pytest.fixture
+def config():
+    return {}
+
+@pytest.fixture
+def app(tmp_path, config):
+    app = create_app({'TESTING': True, 'GRAPH_BACKEND': 'memory', 'RESULT_CACHE_DIRECTORY': str(tmp_path / 'cache'), **config})
+    yield app
+    app.extensions['job_manager'].shutdown()
+
+@pytest.fixture
+def client(app):
+    return app.test_client()
+
+def upload(client, spec, **form):
+    ''' Upload a spec and wait for its job. Returns the status of the finished job '''
+    data = yaml.safe_dump(spec, sort_keys=False).encode("utf-8")
+    response = client.post('/upload', data={'file': (io.BytesIO(data), 'spec.yaml'), **form}, headers={'Accept': 'application/json'})
+    assert response.status_code == 202
+    for count in range(200):
+        job = client.get(f'/jobs/{response.json["id"]}/status').json
+        if job['stage'] in ('done', 'failed'):
+            return job
+        time.sleep(0.05)
+    raise AssertionError(f'job {response.json["id"]} did not finish')
+
+def clear_results(app):
+    ''' Drop all cached results, so the routes have to read the graph again '''
+    cache = app.extensions['result_cache']
+    cache.memory.clear()
+    for entry in os.scandir(cache.directory):
+        os.remove(entry.path)
+
+def test_namespace_uploads_are_read_from_the_namespace(app, client):
+    upload(client, generate_spec(schemas=4, paths=4), namespace='proj')
+    job = upload(client, generate_spec(schemas=5, paths=6), namespace='proj')
+    assert job['stage'] == 'done'
+    assert job['graph_id'] == 'proj'
+    expected = SequenceGenerator('proj', app.extensions['graph_backend']).get_results()
+
+    # The session routes read the graph of the namespace
+    assert client.get(f'/jobs/{job["id"]}').status_code == 302
+    response = client.get('/export/endpoint_statistics')
+    assert response.status_code == 200
+    assert list(response.json) == list(expected['endpoint_list'])
+    response = client.get('/export/endpoint_list?sequences=factorised')
+    assert response.status_code == 200
+    assert list(response.json) == list(expected['endpoint_list'])
+
+    # The json api finds the graph of the last upload into the namespace by its spec hash
+    clear_results(app)
+    response = client.get(f'/api/specs/{job["spec_hash"]}/endpoint_list')
+    assert response.status_code == 200
+    assert response.data.decode("utf-8") == json.dumps(expected['endpoint_list'], indent=4)
+    response = client.get(f'/api/specs/{job["spec_hash"]}/endpoints', query_string={'name': '/entity0s, post'})
+    assert response.json == {'/entity0s, post': expected['endpoint_list']['/entity0s, post']}
+
+@pytest.mark.parametrize("config", [{'RESULT_CACHE_DISK_BYTES': 1000}])
+def test_results_larger_than_the_disk_cache(app, client):
+    job = upload(client, generate_spec(schemas=5, paths=6))
+    expected = json.dumps(SequenceGenerator(job['graph_id'], app.extensions['graph_backend']).get_results()['endpoint_list'], indent=4)
+
+    # The result that was just written is kept, although it does not fit into the disk tier
+    cache = app.extensions['result_cache']
+    assert cache.endpoint_list(job['spec_hash']) is not None
+    assert client.get(f'/jobs/{job["id"]}/download/endpoint_list').data.decode("utf-8") == expected
+
+    # Once it is evicted by another result, the endpoint_list is generated from the graph
+    upload(client, generate_spec(schemas=4, paths=4))
+    assert cache.endpoint_list(job['spec_hash']) is None
+    for url in (f'/jobs/{job["id"]}/download/endpoint_list', f'/api/specs/{job["spec_hash"]}/endpoint_list'):
+        response = client.get(url)
+        assert response.status_code == 200
+        assert response.data.decode("utf-8") == expected
+
+def test_endpoint_sequences_from_the_cached_endpoint_list(app, client):
+    job = upload(client, generate_spec(schemas=5, paths=6))
+    endpoint_list = SequenceGenerator(job['graph_id'], app.extensions['graph_backend']).get_results()['endpoint_list']
+    names = ['/entity2s, post', '/entity0s, post']
+
+    response = client.get(f'/api/specs/{job["spec_hash"]}/endpoints', query_string={'name': names})
+    assert response.status_code == 200
+    assert list(response.json) == names
+    assert response.json == {name: endpoint_list[name] for name in names}
+    assert client.get(f'/api/specs/{job["spec_hash"]}/endpoints', query_string={'name': ['/entity0s, post', '/missing, get']}).status_code == 404
+
+    # The file is only read until all endpoints are found
+    cache = app.extensions['result_cache']
+    with open(os.path.join(cache.directory, f'{job["spec_hash"]}.endpoints.ndjson'), "a") as file:
+        file.write("not json\n")
+    assert cache.endpoint_entries(job['spec_hash'], names) == {name: endpoint_list[name] for name in names}
+
+def test_etags_and_downloads(app, client):
+    job = upload(client, generate_spec(schemas=4, paths=4))
+    url = f'/api/specs/{job["spec_hash"]}/object_list'
+
+    response = client.get(url)
+    assert response.status_code == 200
+    assert 'Content-Disposition' not in response.headers
+    etag = response.headers['ETag']
+    response = client.get(url, headers={'If-None-Match': etag})
+    assert response.status_code == 304
+    assert response.data == b''
+    # The version is also known after the results were dropped from the cache
+    clear_results(app)
+    assert client.get(url, headers={'If-None-Match': etag}).status_code == 304
+
+    response = client.get(url, query_string={'download': 1})
+    assert response.headers['Content-Disposition'] == 'attachment; filename=object_list.json'
+    assert response.json == SequenceGenerator(job['graph_id'], app.extensions['graph_backend']).get_results()['object_list']
+    response = client.get(f'/jobs/{job["id"]}/download/object_crud')
+    assert response.status_code == 200
+    assert response.headers['Content-Disposition'] == 'attachment; filename=object_crud.json'
+    assert 'Entity0' in response.json
+    assert client.get(f'/jobs/{job["id"]}/download/object_crud', headers={'If-None-Match': response.headers['ETag']}).status_code == 304
+
+def test_unknown_specs_and_templates(app, client):
+    job = upload(client, generate_spec(schemas=4, paths=4))
+    unknown = '0' * 64
+    # An unknown spec hash is no known version, whatever the client sends
+    assert client.get(f'/api/specs/{unknown}/object_list').status_code == 404
+    assert client.get(f'/api/specs/{unknown}/object_list', headers={'If-None-Match': f'"{unknown}-object_list"'}).status_code == 404
+    assert client.get(f'/api/specs/{unknown}/info', headers={'If-None-Match': '*'}).status_code == 404
+    assert client.get(f'/api/specs/{unknown}/endpoints', query_string={'name': '/entity0s, post'}, headers={'If-None-Match': '*'}).status_code == 404
+
+    assert client.get(f'/api/specs/{job["spec_hash"]}/graph').status_code == 404
+    assert client.get(f'/jobs/{job["id"]}/download/graph').status_code == 404
+    assert client.get('/jobs/unknown/download/object_list').status_code == 404
+
+@pytest.mark.parametrize("config", [{'VALIDATION_LEVEL': 'structral'}, {'PROPERTY_DEPTH': 0}])
+def test_invalid_settings_are_rejected(tmp_path, config):
+    with pytest.raises(ValueError):
+        create_app({'TESTING': True, 'GRAPH_BACKEND': 'memory', 'RESULT_CACHE_DIRECTORY': str(tmp_path / 'cache'), **config})
@@ -0,0 +1,95 @@
+import random
+import time
+
+from src.sequences import factorise_sequences, expand_sequences, count_sequences, endpoint_entry
+
+import legacy
+
+def random_crud(generator, objects):
+    ''' object_crud with 0-2 create and delete endpoints per object '''
+    return {
+        object_name: {
+            "create": [f'{object_name} create{count}' for count in range(generator.randint(0, 2))],
+            "delete": [f'{object_name} delete{count}' for count in range(generator.randint(0, 2))]
+        }
+        for object_name in objects
+    }
+
+def random_crud_endpoint(generator, objects):
+    ''' None or the create/delete role of the endpoint for one of the objects '''
+    if generator.random() < 0.3:
+        return None
+    return (generator.choice(objects), generator.choice(["create", "delete"]))
+
+def test_expand_sequences_matches_list_expansion():
+    generator = random.Random(11)
+    for case in range(500):
+        path = [f'O{count}' for count in range(generator.randint(1, 6))]
+        generator.shuffle(path)
+        crud = random_crud(generator, path)
+        crud_endpoint = random_crud_endpoint(generator, path)
+
+        preparation, dismantling = factorise_sequences(path, crud_endpoint, crud)
+        expected_preparation, expected_dismantling = legacy.sequences(path, crud_endpoint, crud)
+        assert list(expand_sequences(preparation)) == expected_preparation
+        assert list(expand_sequences(dismantling)) == expected_dismantling
+        assert count_sequences(preparation) == (len(expected_preparation), sum(map(len, expected_preparation)))
+
+def test_expand_sequences_is_linear_in_the_chain_length():
+    path = [f'O{count}' for count in range(200)]
+    crud = {object_name: {"create": [f'{object_name} create'], "delete": []} for object_name in path}
+    preparation, dismantling = factorise_sequences(path, None, crud)
+
+    start = time.perf_counter()
+    sequences = list(expand_sequences(preparation))
+    assert time.perf_counter() - start < 1.0
+    assert sequences == [[f'{object_name} create' for object_name in path]]
+
+def test_expand_sequences_is_lazy():
+    path = [f'O{count}' for count in range(30)]
+    crud = {object_name: {"create": [f'{object_name} create0', f'{object_name} create1'], "delete": []} for object_name in path}
+    preparation, dismantling = factorise_sequences(path, None, crud)
+    assert count_sequences(preparation)[0] == 2 ** 30
+
+    # The first sequences are created without expanding all 2^30 others
+    start = time.perf_counter()
+    sequences = expand_sequences(preparation)
+    first, second = next(sequences), next(sequences)
+    assert time.perf_counter() - start < 0.1
+    assert first == [f'{object_name} create0' for object_name in path]
+    assert second == ['O0 create1'] + [f'{object_name} create0' for object_name in path[1:]]
+
+def count_only_task(objects, dependencies, crud_endpoint, crud):
+    ''' Task of SequenceGenerator for endpoint_entry in count only mode '''
+    return {
+        "connected_with_objects": objects,
+        "dependencies": dependencies,
+        "crud_endpoint": crud_endpoint,
+        "object_crud": crud,
+        "max_orderings": None,
+        "count_only": True,
+        "factorised": False
+    }
+
+def test_count_only_when_the_deleted_object_comes_first():
+    crud = {"O0": {"create": ["O0 create"], "delete": []}, "O1": {"create": ["O1 create"], "delete": ["O1 delete"]}}
+    entry = endpoint_entry(count_only_task(["O1", "O0"], [], ("O1", "delete"), crud))
+    assert entry["sequence_length"] == legacy.endpoint_entry(["O1", "O0"], [], ("O1", "delete"), crud)["sequence_length"] == 3
+    assert entry["ordering_count"] == 2
+
+def test_count_only_matches_all_permutations():
+    generator = random.Random(3)
+    for case in range(1000):
+        objects = [f'O{count}' for count in range(generator.randint(1, 5))]
+        dependencies = [
+            (before, after) for before in objects for after in objects
+            if objects.index(before) < objects.index(after) and generator.random() < 0.25
+        ]
+        generator.shuffle(objects)
+        crud = random_crud(generator, objects)
+        crud_endpoint = random_crud_endpoint(generator, objects)
+
+        expected = legacy.endpoint_entry(objects, dependencies, crud_endpoint, crud)
+        entry = endpoint_entry(count_only_task(objects, dependencies, crud_endpoint, crud))
+        assert entry["sequence_length"] == expected["sequence_length"]
+        assert entry["ordering_count"] == len(legacy.orderings(objects, dependencies))
@@ -0,0 +1,18 @@
+import json
+
+import yaml
+from jsonschema_path.loaders import JsonschemaSafeLoader
+
+from src.SpecCache import parse_spec
+
+def test_yaml_keys_are_strings_like_in_json():
+    data = b"""
+responses: &responses {200: ok, 404: missing, default: other, true: yes, null: nothing, 1.5: half}
+paths:
+  /a: {get: {responses: *responses}}
+  /b: [*responses, {201: created}]
+created: 2024-01-01
+"""
+    spec_dict = parse_spec(data, "spec.yaml")
+    assert json.dumps(spec_dict) == json.dumps(json.loads(json.dumps(yaml.load(data, Loader=JsonschemaSafeLoader))))
+    assert list(spec_dict["responses"]) == ["200", "404", "default", "true", "null", "1.5"]
@@ -0,0 +1,48 @@
+import pytest
+
+from benchmarks.specgen import generate_spec
+from src.GraphGenerator import GraphGenerator
+from src.MemoryBackend import MemoryBackend
+from src.SequenceGenerator import SequenceGenerator
+
+import legacy
+
+def lengths(sequences_list):
+    ''' Shortest and longest sequence, 0 for no sequences '''
+    return (min(map(len, sequences_list)), max(map(len, sequences_list))) if sequences_list else (0, 0)
+
+@pytest.mark.parametrize("seed", range(4))
+def test_statistics_match_all_permutations(seed):
+    backend = MemoryBackend()
+    GraphGenerator(generate_spec(schemas=6, fan_out=2, depth=3, paths=8, operations=4, crud=seed % 3, seed=seed), "spec", backend).create_graph()
+    # The graph is loaded by the statistics, without creating any template
+    statistics = SequenceGenerator("spec", backend).get_endpoint_statistics()
+
+    graph = backend.load_graph("spec")
+    crud = legacy.object_crud(graph)
+    for endpoint_name in graph.endpoints:
+        objects, dependencies = legacy.endpoint_dependencies(graph, endpoint_name)
+        entry = legacy.endpoint_entry(objects, dependencies, legacy.crud_endpoint(endpoint_name, crud), crud)
+        preparation_lengths = lengths(entry["preparation"])
+        dismantling_lengths = lengths(entry["dismantling"])
+        assert statistics[endpoint_name] == {
+            "connected_with_objects": objects,
+            "ordering_count": len(legacy.orderings(objects, dependencies)),
+            "preparation_count": len(entry["preparation"]),
+            "dismantling_count": len(entry["dismantling"]),
+            "sequence_length": entry["sequence_length"],
+            "min_length": preparation_lengths[0] + dismantling_lengths[0],
+            "max_length": preparation_lengths[1] + dismantling_lengths[1]
+        }
+
+def test_generators_load_the_graph():
+    backend = MemoryBackend()
+    GraphGenerator(generate_spec(schemas=3, paths=4), "spec", backend).create_graph()
+    results = SequenceGenerator("spec", backend).get_results()
+    assert dict(SequenceGenerator("spec", backend).iter_endpoint_list()) == results["endpoint_list"]
+    assert list(SequenceGenerator("spec", backend).iter_endpoint_statistics()) != []
+    # A missing graph is reported when the generator is created
+    with pytest.raises(LookupError):
+        SequenceGenerator("missing", backend).iter_endpoint_statistics()
+    with pytest.raises(LookupError):
+        SequenceGenerator("missing", backend).iter_endpoint_list()